@@ -0,0 +1,299 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from engine import AlphaBetaSearch, CachedSearch, PerfectStrategy, find_best_move
+from engine.search import FlatSearch
+from simulate import make_strategy, play_game
+
+try:
+    from engine import batch
+except ImportError:  # NumPy isn't installed; the batch cases are skipped
+    batch = None
+
+# Benchmarks for move selection.
+#
+# Every case is timed `repeat` times and reported by its median. Results are
+# written as JSON; pass --baseline to compare against a saved run and flag
+# regressions (the exit status is 1 if any case got slower than the
+# threshold allows). The allocation cases trace each search with tracemalloc
+# and report the peak and retained bytes it allocated. tracemalloc only sees
+# memory while it is held, so these catch caches and objects kept alive down
+# the recursion, not objects created and freed again at every node; FlatSearch
+# avoids those by keeping its loop within CPython's cached small ints.
+# tests/test_allocations.py holds FlatSearch to a fixed peak and nothing retained.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "bench_baseline.json")
+
+# Mid-game positions, computer ("O") to move
+MID_GAME = (
+    ("X  "
+     " O "
+     "  X"),
+    ("XX "
+     " O "
+     "   "),
+    ("X O"
+     " X "
+     "   "),
+    (" X "
+     "XO "
+     "   "),
+    ("XOX"
+     " X "
+     "O  "),
+    ("X  "
+     "OX "
+     "  O"),
+)
+
+
+def _board(cells):
+    return [list(cells[r * 3:r * 3 + 3]) for r in range(3)]
+
+
+def _empty():
+    return [[" " for _ in range(3)] for _ in range(3)]
+
+
+def measure(fn, repeat, number=1):
+    """Returns the median and best time per call, in microseconds."""
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return statistics.median(times) * 1e6, min(times) * 1e6
+
+
+def latency_cases():
+    """Returns {name: (fn, calls per run)} for the move-latency benchmarks."""
+    perfect = PerfectStrategy()
+    warm = CachedSearch()
+    mid_game = [_board(cells) for cells in MID_GAME]
+
+    searches = {
+        "plain_minimax": (lambda board: find_best_move(board, "O", "X"), 1),
+        "cached_cold": (lambda board: CachedSearch().find_best_move(board, "O", "X"), 10),
+        "cached_warm": (lambda board: warm.find_best_move(board, "O", "X"), 1000),
+        "alphabeta": (lambda board: AlphaBetaSearch().find_best_move(board, "O", "X"), 10),
+        "flat": (lambda board: FlatSearch().find_best_move(board, "O", "X"), 10),
+        "table_lookup": (lambda board: perfect.choose_move(board, "O", "X"), 10000),
+    }
+    cases = {}
+    for name, (search, number) in searches.items():
+        cases[f"first_move/{name}"] = (lambda search=search: search(_empty()), number)
+        cases[f"mid_game/{name}"] = (lambda search=search: [search(board) for board in mid_game], number)
+    return cases
+
+
+def batch_cases():
+    """Returns {name: (fn, calls per run)} comparing batched and one-at-a-time evaluation of 1000 boards."""
+    perfect = PerfectStrategy()
+    boards = [_board(MID_GAME[i % len(MID_GAME)]) for i in range(1000)]
+    cases = {"batch_1000/sequential": (lambda: [perfect.choose_move(board, "O", "X") for board in boards], 10)}
+    if batch is not None:
+        cells = batch.encode_boards(boards)
+        cases["batch_1000/vectorised"] = (lambda: batch.best_moves(cells, "O"), 10)
+    return cases
+
+
+def allocation_cases():
+    """Returns {name: (factory, boards)}: factory() gives a fresh find_best_move, traced over the boards."""
+    mid_game = [_board(cells) for cells in MID_GAME]
+    searches = {
+        "plain_minimax": lambda: find_best_move,
+        "cached_cold": lambda: CachedSearch().find_best_move,
+        "alphabeta": lambda: AlphaBetaSearch().find_best_move,
+        "flat": lambda: FlatSearch().find_best_move,
+    }
+    cases = {}
+    for name, make in searches.items():
+        if name != "plain_minimax":  # Seconds per call, and slower still under tracemalloc
+            cases[f"allocations/first_move/{name}"] = (make, [_empty()])
+        cases[f"allocations/mid_game/{name}"] = (make, mid_game)
+    return cases
+
+
+def allocations(fn):
+    """Runs fn under tracemalloc; returns (peak, retained) bytes allocated during the call."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before, current - before
+
+
+def trace_search(make, boards):
+    """Returns (peak, retained) bytes for a fresh search from make() over the boards, after a warm-up search."""
+    make()(boards[0], "O", "X")  # Warm up the interpreter on a throwaway search
+    search = make()
+    return allocations(lambda: [search(board, "O", "X") for board in boards])
+
+
+def game_cases():
+    """Returns {name: (fn, calls per run)} timing one self-play game per call."""
+    cases = {}
+    for name in ("easy", "hard", "mistake-medium", "perfect"):
+        move = make_strategy(name)
+
+        def game(move=move):
+            play_game(move, move)
+        cases[f"full_game/{name}"] = (game, 200)
+    return cases
+
+
+# Fresh interpreters, timed from launch to exit: cold start of the pieces a game loads
+STARTUP = {
+    "startup/interpreter": "pass",
+    "startup/engine_import": "import engine",
+    "startup/first_move": "import engine; engine.MistakeStrategy(0.2).choose_move(engine.new_board(), 'O', 'X')",
+    "startup/gui_module_headless": (
+        "import runpy, sys; runpy.run_path('choose-level-with-gui.py'); "
+        "assert 'tkinter' not in sys.modules, 'importing the GUI module loaded tkinter'"
+    ),
+}
+
+
+def startup_cases():
+    """Returns {name: (fn, calls per run)} that each start a Python process."""
+    def start(code):
+        return lambda: subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True)
+    return {name: (start(code), 1) for name, code in STARTUP.items()}
+
+
+def throughput_cases():
+    """Returns {name: search factory} for the nodes-per-second benchmarks."""
+    return {
+        "nodes_per_second/full_tree": lambda: AlphaBetaSearch(pruning=False),
+        "nodes_per_second/alphabeta": AlphaBetaSearch,
+        "nodes_per_second/cached_cold": CachedSearch,
+        "nodes_per_second/flat": FlatSearch,
+    }
+
+
+def nodes_per_second(make, repeat):
+    """Searches the empty board with fresh searches; returns the median nodes visited per second."""
+    rates = []
+    for _ in range(repeat):
+        search = make()
+        started = time.perf_counter()
+        search.find_best_move(_empty(), "O", "X")
+        rates.append(search.nodes / (time.perf_counter() - started))
+    return statistics.median(rates)
+
+
+def run(repeat=5, pattern=None):
+    """Runs every benchmark (or those whose name contains `pattern`)."""
+    random.seed(0)
+    results = {}
+    for name, (fn, number) in {**latency_cases(), **batch_cases(), **game_cases(), **startup_cases()}.items():
+        if pattern and pattern not in name:
+            continue
+        median, best = measure(fn, repeat, number)
+        results[name] = {"value": round(median, 3), "best": round(best, 3), "unit": "us", "better": "lower"}
+    for name, make in throughput_cases().items():
+        if pattern and pattern not in name:
+            continue
+        rate = nodes_per_second(make, repeat)
+        results[name] = {"value": round(rate), "unit": "nodes/s", "better": "higher"}
+    for name, (make, boards) in allocation_cases().items():
+        if pattern and pattern not in name:
+            continue
+        peak, retained = trace_search(make, boards)
+        results[name] = {"value": peak, "retained": retained, "unit": "bytes", "better": "lower"}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.1):
+    """Adds a per-case comparison against a baseline; returns the names that regressed."""
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        if base["value"]:
+            ratio = result["value"] / base["value"]
+        else:
+            ratio = 1.0 if result["value"] == base["value"] else float("inf")
+        if result["better"] == "lower":
+            regressed = ratio > 1 + threshold
+        else:
+            regressed = ratio < 1 - threshold
+        result["baseline"] = base["value"]
+        result["ratio"] = round(ratio, 3)
+        result["regressed"] = regressed
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark move selection.")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (the median is reported)")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_FILE, default=None,
+                        help="compare against a saved report (default file: bench_baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_FILE, default=None,
+                        help="save this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown before a case counts as regressed")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.filter)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+
+    for name in regressions:
+        result = report["results"][name]
+        print(f"REGRESSION {name}: {result['value']} {result['unit']} vs baseline {result['baseline']}",
+              file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import math
+import multiprocessing
+import os
+
+from engine.difficulty import DIFFICULTY_FILE, save_config
+from simulate import check_strategy, simulate
+
+# Tunes mistake_chance for each difficulty level from simulated games.
+#
+# A reference opponent stands in for a human and plays X against the
+# mistake-mixed AI. For each level we bisect on mistake_chance until the
+# opponent's result rate hits the target: more mistakes always help the
+# opponent. Each probe plays batches until the 95% confidence interval either
+# excludes the target (so we know which way to move) or is tight enough.
+
+DEFAULT_TARGETS = {
+    "easy": 0.35,
+    "medium": 0.28,
+    "hard": 0.21,
+}
+
+# How a game counts for the reference opponent
+METRICS = {
+    "not-lose": lambda result: result["x_wins"] + result["draws"],
+    "win": lambda result: result["x_wins"],
+}
+
+Z_95 = 1.96
+
+
+def wilson_interval(successes, games, z=Z_95):
+    """Returns the Wilson score confidence interval for a rate."""
+    if games == 0:
+        return 0.0, 1.0
+    rate = successes / games
+    denominator = 1 + z * z / games
+    center = (rate + z * z / (2 * games)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return center - half_width, center + half_width
+
+
+class Calibrator:
+    """Runs the probes for every level on one shared process pool."""
+
+    def __init__(self, references, metric="not-lose", tolerance=0.01, chance_tolerance=0.01,
+                 batch=2000, max_games=40000, seed=0, pool=None, workers=1):
+        self.references = references
+        self.metric = METRICS[metric]
+        self.tolerance = tolerance
+        self.chance_tolerance = chance_tolerance
+        self.batch = batch
+        self.max_games = max_games
+        self.seed = seed
+        self.pool = pool
+        self.workers = workers
+        self.chunk_size = max(1, batch // 8)  # Fixed split, so results don't depend on the worker count
+        self.games_played = 0
+        self.probes = 0
+
+    def measure(self, chance, target):
+        """Plays batches at one mistake chance; returns (rate, low, high, games)."""
+        successes = games = 0
+        while games < self.max_games:
+            for reference in self.references:
+                self.probes += 1
+                result = simulate(reference, f"mistake:{chance}", self.batch, self.workers,
+                                  self.seed * 1_000_003 + self.probes, self.chunk_size, self.pool)
+                successes += self.metric(result)
+                games += self.batch
+            low, high = wilson_interval(successes, games)
+            if high < target or low > target:
+                break  # Clearly off target; the direction is known
+            if (high - low) / 2 <= self.tolerance:
+                break  # On target within tolerance
+        self.games_played += games
+        low, high = wilson_interval(successes, games)
+        return successes / games, low, high, games
+
+    def calibrate(self, target):
+        """Bisects on mistake_chance for one target rate; returns (chance, rate)."""
+        low_chance, high_chance = 0.0, 1.0
+        best = None
+        while True:
+            chance = round((low_chance + high_chance) / 2, 4)
+            rate, low, high, _ = self.measure(chance, target)
+            if best is None or abs(rate - target) < abs(best[1] - target):
+                best = (chance, rate)
+            if low <= target <= high and (high - low) / 2 <= self.tolerance:
+                return chance, rate
+            if rate < target:
+                low_chance = chance  # Needs more mistakes
+            else:
+                high_chance = chance
+            if high_chance - low_chance <= self.chance_tolerance:
+                return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate mistake_chance for each difficulty level.")
+    parser.add_argument("--target", action="append", default=[], metavar="LEVEL=RATE",
+                        help="target opponent rate for a level (default: "
+                             + ", ".join(f"{level}={rate}" for level, rate in DEFAULT_TARGETS.items()) + ")")
+    parser.add_argument("--reference", action="append", default=[],
+                        help="opponent strategy standing in for a human (default: easy); repeatable")
+    parser.add_argument("--metric", choices=METRICS, default="not-lose",
+                        help="what the target rate counts for the opponent")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="accepted confidence-interval half-width")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DIFFICULTY_FILE)
+    args = parser.parse_args()
+
+    targets = dict(DEFAULT_TARGETS)
+    for item in args.target:
+        level, _, rate = item.partition("=")
+        try:
+            targets[level] = float(rate)
+        except ValueError:
+            parser.error(f"Invalid target {item!r}; use LEVEL=RATE")
+    references = args.reference or ["easy"]
+    for name in references:
+        try:
+            check_strategy(name)
+        except ValueError as error:
+            parser.error(str(error))
+
+    workers = args.workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers) as pool:
+        calibrator = Calibrator(references, args.metric, args.tolerance, seed=args.seed, pool=pool, workers=workers)
+        mistake_chance = {}
+        measured = {}
+        for level, target in targets.items():
+            chance, rate = calibrator.calibrate(target)
+            mistake_chance[level] = chance
+            measured[level] = round(rate, 4)
+            print(f"{level:8} target {target:.3f}  measured {rate:.3f}  mistake_chance {chance}")
+
+    save_config(mistake_chance, {
+        "references": references,
+        "metric": args.metric,
+        "targets": targets,
+        "measured": measured,
+        "seed": args.seed,
+    }, args.output)
+    print(f"{calibrator.games_played} games; wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
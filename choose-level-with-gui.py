@@ -1,22 +1,69 @@
-import tkinter as tk
+import argparse
+import math
+import queue
 import random
+import threading
+import time
+
+STARTED = time.perf_counter()  # For --startup-time, before the engine imports (most of the start-up time)
+
+from engine import GameState, MistakeStrategy, load_mistake_chance, make_search  # noqa: E402
+from engine.analysis import DRAW, LOSS, WIN, heatmap  # noqa: E402
+from engine.records import MAX_SEED, draw_seed, record_game  # noqa: E402
 
 # Difficulty levels
 DIFFICULTY = "medium"  # Change to "easy", "medium", or "hard"
+# Or "alphabeta": prunes and prefers quicker wins; "flat": allocation-free; "state": make/unmake on a GameState
+SEARCH_MODE = "minimax"
+
+# Chance of a mistake per difficulty level, shared with choose-level.py (see calibrate.py)
+mistake_chance = load_mistake_chance()
+
+# Shared move search and one strategy per level, built once
+search = make_search(SEARCH_MODE)
+strategies = {level: MistakeStrategy(chance, search) for level, chance in mistake_chance.items()}
+
+# Tint each free cell by what playing there leads to (or pass --shade)
+SHADE_MOVES = False
+MOVE_COLORS = {WIN: "#b8e6b8", DRAW: "#f2e6a6", LOSS: "#f2b8b8"}
+
+AI_DELAY_MS = 500  # Minimum time the computer appears to think
+POLL_MS = 20  # How often the Tk loop checks for a finished search
+
+# Multi-board mode (--boards N): computer moves and redraws are batched once per tick
+TICK_MS = 50
+RESTART_TICKS = 20  # Spectating: how long a finished board stays up before the next game
 
-mistake_chance = {
-    "easy": 0.8,  # 80% mistakes
-    "medium": 0.3,  # 30% mistakes
-    "hard": 0.0  # Perfect AI
-}
+tk = None  # tkinter, imported when the first window opens so headless imports stay GUI-free
+
+def load_tk():
+    """Imports tkinter on first use."""
+    global tk
+    if tk is None:
+        import tkinter
+        tk = tkinter
+    return tk
 
 class TicTacToe:
-    def __init__(self):
+    def __init__(self, shade=None, record=None, seed=None):
+        load_tk()
+        self.shade = SHADE_MOVES if shade is None else shade
+        self.record = record  # Record file each finished game is appended to
+        self.seed = seed  # First game's seed; each restart takes the next one
+        self.games = 0
         self.window = tk.Tk()
         self.window.title("Tic-Tac-Toe")
-        self.board = [[" " for _ in range(3)] for _ in range(3)]
+        self.state = GameState()  # Tracks lines and free cells as moves are played
+        self.board = self.state.board
         self.current_player = "X"
         self.buttons = [[None for _ in range(3)] for _ in range(3)]
+        self.start_rng()
+        self.requests = queue.Queue()  # (search_id, board, strategy) for the worker thread
+        self.results = queue.Queue()  # (search_id, move) from the worker thread
+        self.search_id = 0  # Bumped to cancel a pending search
+        # One worker runs every search in turn, so the shared search object is never used by two threads at once
+        self.worker = threading.Thread(target=self.search_worker, daemon=True)
+        self.worker.start()
         self.create_board()
 
     def create_board(self):
@@ -33,22 +80,52 @@ class TicTacToe:
         # ADD A RESTART BUTTON
         self.restart_button = tk.Button(self.window, text="Restart Game", font=("Arial", 14), command=self.reset_game)
         self.restart_button.grid(row=4, column=0, columnspan=3)
+        self.default_color = self.buttons[0][0].cget("background")
+        self.shade_moves()
 
     def reset_game(self):
         """Resets the board to start a new game."""
-        self.board = [[" " for _ in range(3)] for _ in range(3)]
+        self.cancel_search()
+        self.state.reset()  # Clears self.board in place
         self.current_player = "X"
+        self.games += 1
+        self.start_rng()
         self.label.config(text="Player X's Turn")
 
         # Reset all buttons
         for r in range(3):
             for c in range(3):
                 self.buttons[r][c].config(text=" ", state=tk.NORMAL)
+        self.shade_moves()
+
+    def start_rng(self):
+        """Gives a seeded or recorded game its own seeded strategy, so the stored seed replays it."""
+        self.game_seed = None
+        self.strategy = strategies[DIFFICULTY]
+        if self.seed is not None:
+            self.game_seed = (self.seed + self.games) & MAX_SEED
+        elif self.record:
+            self.game_seed = draw_seed()
+        if self.game_seed is not None:
+            self.strategy = MistakeStrategy(mistake_chance[DIFFICULTY], search, rng=random.Random(self.game_seed))
+
+    def shade_moves(self, active=True):
+        """Tints the free cells by the value of X playing there, from one analysis of the board.
+
+        With active=False (or shading off) every cell gets its normal color back.
+        """
+        if not self.shade:
+            return
+        grid = heatmap(self.board, "X") if active else [[None] * 3 for _ in range(3)]
+        for r in range(3):
+            for c in range(3):
+                move = grid[r][c]
+                self.buttons[r][c].config(background=self.default_color if move is None else MOVE_COLORS[move.value])
 
     def make_move(self, row, col):
         """Handles a player's move and AI's response."""
-        if self.board[row][col] == " ":
-            self.board[row][col] = "X"
+        if self.current_player == "X" and self.board[row][col] == " ":
+            self.state.play(row, col, "X")
             self.buttons[row][col].config(text="X", state=tk.DISABLED)
             if self.check_winner("X"):
                 self.label.config(text="Player X Wins!")
@@ -60,12 +137,55 @@ class TicTacToe:
                 return
 
             self.label.config(text="Computer's Turn")
-            self.window.after(500, self.computer_move)
+            self.shade_moves(active=False)
+            self.start_search()
+
+    def start_search(self):
+        """Hands the AI search to the worker thread so the window stays responsive."""
+        self.current_player = "O"
+        self.search_id += 1
+        self.requests.put((self.search_id, [row[:] for row in self.board], self.strategy))
+        self.window.after(POLL_MS, self.poll_search, self.search_id, time.perf_counter())
+
+    def search_worker(self):
+        """Runs on the worker thread: searches each requested board copy in turn and queues the moves."""
+        while True:
+            search_id, board, strategy = self.requests.get()
+            if search_id != self.search_id:
+                continue  # Cancelled by a restart before it started
+            self.results.put((search_id, self.choose_ai_move(board, strategy)))
+
+    def poll_search(self, search_id, started):
+        """Runs on the Tk loop: plays the worker's move once it's ready."""
+        if search_id != self.search_id:
+            return  # Cancelled by a restart
+        while True:
+            try:
+                result_id, move = self.results.get_nowait()
+            except queue.Empty:
+                self.window.after(POLL_MS, self.poll_search, search_id, started)
+                return
+            if result_id == search_id:
+                break  # Anything else is a stale result from a cancelled search
+
+        # Only wait for whatever part of the delay the search didn't already take
+        remaining = AI_DELAY_MS - int((time.perf_counter() - started) * 1000)
+        if remaining > 0:
+            self.window.after(remaining, self.computer_move, move, search_id)
+        else:
+            self.computer_move(move, search_id)
 
-    def computer_move(self):
-        """AI selects a move with a chance of making a mistake."""
-        row, col = self.choose_ai_move()
-        self.board[row][col] = "O"
+    def cancel_search(self):
+        """Cancels the pending search: skipped if it hasn't started, its result ignored if it has."""
+        self.search_id += 1
+
+    def computer_move(self, move, search_id):
+        """Plays the move the AI picked."""
+        if search_id != self.search_id:
+            return  # Cancelled by a restart
+        row, col = move
+        self.current_player = "X"
+        self.state.play(row, col, "O")
         self.buttons[row][col].config(text="O", state=tk.DISABLED)
 
         if self.check_winner("O"):
@@ -78,88 +198,26 @@ class TicTacToe:
             return
 
         self.label.config(text="Player X's Turn")
+        self.shade_moves()
 
-    def choose_ai_move(self):
+    def choose_ai_move(self, board, strategy):
         """Chooses a move using AI logic and difficulty settings."""
-        if random.random() < mistake_chance[DIFFICULTY]:
-            return self.make_mistake()
-        else:
-            return self.find_best_move()
-
-    def make_mistake(self):
-        """Makes a mistake by selecting a suboptimal move."""
-        available_moves = self.get_available_moves()
-        for row, col in available_moves:
-            self.board[row][col] = "X"
-            if self.check_winner("X"):
-                self.board[row][col] = " "
-                return row, col
-            self.board[row][col] = " "
-        if (1, 1) in available_moves:
-            return (1, 1)
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        corner_moves = [move for move in corners if move in available_moves]
-        if corner_moves:
-            return random.choice(corner_moves)
-        return random.choice(available_moves)
-
-    def find_best_move(self):
-        """Finds the best move using Minimax for an unbeatable AI."""
-        best_score = -float("inf")
-        best_move = None
-        for row, col in self.get_available_moves():
-            self.board[row][col] = "O"
-            score = self.minimax(0, False)
-            self.board[row][col] = " "
-            if score > best_score:
-                best_score = score
-                best_move = (row, col)
-        return best_move
-
-    def minimax(self, depth, is_maximizing):
-        """Minimax algorithm for perfect AI."""
-        if self.check_winner("O"):
-            return 1
-        if self.check_winner("X"):
-            return -1
-        if self.is_full():
-            return 0
-        if is_maximizing:
-            best_score = -float("inf")
-            for row, col in self.get_available_moves():
-                self.board[row][col] = "O"
-                score = self.minimax(depth + 1, False)
-                self.board[row][col] = " "
-                best_score = max(best_score, score)
-            return best_score
-        else:
-            best_score = float("inf")
-            for row, col in self.get_available_moves():
-                self.board[row][col] = "X"
-                score = self.minimax(depth + 1, True)
-                self.board[row][col] = " "
-                best_score = min(best_score, score)
-            return best_score
+        return strategy.choose_move(board, "O", "X")
 
     def check_winner(self, player):
         """Checks if a player has won."""
-        for i in range(3):
-            if all(self.board[i][j] == player for j in range(3)) or all(self.board[j][i] == player for j in range(3)):
-                return True
-        if all(self.board[i][i] == player for i in range(3)) or all(self.board[i][2 - i] == player for i in range(3)):
-            return True
-        return False
+        return self.state.check_winner(player)
 
     def is_full(self):
         """Checks if the board is full."""
-        return all(self.board[r][c] != " " for r in range(3) for c in range(3))
-
-    def get_available_moves(self):
-        """Returns available moves."""
-        return [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == " "]
+        return self.state.is_full()
 
     def end_game(self):
-        """Disables buttons when the game ends."""
+        """Disables buttons when the game ends and records it if asked to."""
+        self.shade_moves(active=False)
+        if self.record:
+            record_game(self.record, self.state.history, "human", f"mistake-{DIFFICULTY}", self.game_seed,
+                        o_difficulty=mistake_chance[DIFFICULTY])
         for r in range(3):
             for c in range(3):
                 self.buttons[r][c].config(state=tk.DISABLED)
@@ -168,6 +226,175 @@ class TicTacToe:
         """Runs the game window."""
         self.window.mainloop()
 
-# Start the game
-game = TicTacToe()
-game.run()
\ No newline at end of file
+class MultiBoard:
+    """Many boards in one window, all played by the module's shared strategies and search.
+
+    With spectate=True the computer plays both sides (`x_level` as X against
+    DIFFICULTY as O) and finished boards start over; otherwise click a cell on
+    any board to play X there, and click a finished board to restart it. Every
+    tick plays one computer move on each board that is waiting for one, then
+    redraws only the cells and labels that changed since the last tick.
+    """
+
+    def __init__(self, count, spectate=False, x_level="hard", columns=None):
+        load_tk()
+        self.window = tk.Tk()
+        self.window.title(f"Tic-Tac-Toe x {count}")
+        self.spectate = spectate
+        self.players = {"X": strategies[x_level], "O": strategies[DIFFICULTY]}
+        self.states = [GameState() for _ in range(count)]
+        self.waiting = set()  # Boards where the computer is to move
+        self.finished = {}  # Board -> tick it finished on
+        self.totals = {"X": 0, "O": 0, None: 0}
+        self.ticks = 0
+
+        # Widgets, and what each one shows now, so unchanged ones are never touched
+        self.cells = []
+        self.labels = []
+        self.shown = {}
+        self.dirty_cells = set()  # (board, cell) changed since the last redraw
+        self.dirty_labels = set()
+        columns = columns or math.ceil(math.sqrt(count))
+        for index in range(count):
+            frame = tk.Frame(self.window, padx=4, pady=4)
+            frame.grid(row=index // columns, column=index % columns)
+            cells = []
+            for cell in range(9):
+                widget = tk.Label(frame, text=" ", font=("Arial", 14), width=2, relief="ridge")
+                widget.grid(row=cell // 3, column=cell % 3)
+                widget.bind("<Button-1>", lambda event, index=index, cell=cell: self.click(index, cell))
+                cells.append(widget)
+            self.cells.append(cells)
+            label = tk.Label(frame, text="", font=("Arial", 10))
+            label.grid(row=3, column=0, columnspan=3)
+            self.labels.append(label)
+        self.summary = tk.Label(self.window, text="", font=("Arial", 12))
+        self.summary.grid(row=math.ceil(count / columns), column=0, columnspan=columns)
+
+        if spectate:
+            self.waiting.update(range(count))
+        self.dirty_labels.update(range(count))
+        self.redraw()
+        self.window.after(TICK_MS, self.tick)
+
+    def click(self, index, cell):
+        """Plays X on a board (or restarts it once it's over)."""
+        if self.spectate:
+            return
+        state = self.states[index]
+        if index in self.finished:
+            self.restart(index)
+        elif index not in self.waiting and state.free & 1 << cell:
+            if not self.play(index, cell, "X"):
+                self.waiting.add(index)
+        self.redraw()  # A click shows at once; the reply comes with the next tick
+
+    def play(self, index, cell, mark):
+        """Plays a move and marks what changed; returns True if it ended the game."""
+        state = self.states[index]
+        row, col = divmod(cell, 3)
+        won = state.play(row, col, mark)
+        self.dirty_cells.add((index, cell))
+        self.dirty_labels.add(index)
+        if won or state.is_full():
+            self.finished[index] = self.ticks
+            self.waiting.discard(index)
+            self.totals[mark if won else None] += 1
+            return True
+        return False
+
+    def restart(self, index):
+        state = self.states[index]
+        self.dirty_cells.update((index, cell) for cell in state.history)
+        state.reset()
+        del self.finished[index]
+        self.dirty_labels.add(index)
+        if self.spectate:
+            self.waiting.add(index)
+
+    def tick(self):
+        """Plays one computer move on every waiting board, restarts finished ones when spectating, redraws."""
+        self.ticks += 1
+        for index in sorted(self.waiting):
+            state = self.states[index]
+            mark = "X" if len(state.history) % 2 == 0 else "O"
+            other = "O" if mark == "X" else "X"
+            row, col = self.players[mark].choose_move(state.board, mark, other)
+            if not self.play(index, row * 3 + col, mark) and not self.spectate:
+                self.waiting.discard(index)  # The player's turn again
+        if self.spectate:
+            for index, finished in list(self.finished.items()):
+                if self.ticks - finished >= RESTART_TICKS:
+                    self.restart(index)
+        self.redraw()
+        self.window.after(TICK_MS, self.tick)
+
+    def status(self, index):
+        state = self.states[index]
+        if state.winner is not None:
+            return f"{state.winner} wins"
+        if state.is_full():
+            return "Draw"
+        if index in self.waiting and not self.spectate:
+            return "Thinking..."
+        return f"{'XO'[len(state.history) % 2]} to move"
+
+    def redraw(self):
+        """Applies the changes since the last redraw: one config call per widget whose text changed."""
+        for index, cell in self.dirty_cells:
+            row, col = divmod(cell, 3)
+            self._show(self.cells[index][cell], self.states[index].board[row][col])
+        for index in self.dirty_labels:
+            self._show(self.labels[index], self.status(index))
+        self.dirty_cells.clear()
+        self.dirty_labels.clear()
+        self._show(self.summary, f"X wins {self.totals['X']}   O wins {self.totals['O']}   Draws {self.totals[None]}")
+
+    def _show(self, widget, text):
+        if self.shown.get(widget) != text:
+            widget.config(text=text)
+            self.shown[widget] = text
+
+    def run(self):
+        self.window.mainloop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the computer in a window.")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time from start-up to the first drawn frame, then exit")
+    parser.add_argument("--shade", action="store_true",
+                        help="tint free cells green/yellow/red by the value of playing there")
+    parser.add_argument("--boards", type=int, default=0, metavar="N", help="show N boards in one window")
+    parser.add_argument("--spectate", action="store_true", help="with --boards: the computer plays both sides")
+    parser.add_argument("--x-level", default=None, choices=sorted(strategies),
+                        help="with --spectate: the level playing X (default: hard)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the computer's mistakes (each restart takes the next seed)")
+    parser.add_argument("--record", metavar="FILE", help="append each finished game to this record file")
+    args = parser.parse_args()
+    if args.boards < 0:
+        parser.error("--boards can't be negative")
+    if not args.boards and (args.spectate or args.x_level):
+        parser.error("--spectate and --x-level need --boards")
+    if args.x_level and not args.spectate:
+        parser.error("--x-level needs --spectate")
+    if args.boards and args.shade:
+        parser.error("--shade applies to the single-board game, not --boards")
+    if args.seed is not None and not 0 <= args.seed <= MAX_SEED:
+        parser.error(f"--seed must be between 0 and {MAX_SEED}")
+    if args.boards and (args.record or args.seed is not None):
+        parser.error("--seed and --record apply to the single-board game, not --boards")
+
+    if args.boards:
+        game = MultiBoard(args.boards, args.spectate, args.x_level or "hard")
+    else:
+        game = TicTacToe(shade=args.shade or None, record=args.record, seed=args.seed)
+    if args.startup_time:
+        game.window.update()  # Draws the first frame
+        print(f"First frame after {(time.perf_counter() - STARTED) * 1000:.1f} ms")
+        game.window.destroy()
+        return
+    game.run()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,32 +1,18 @@
+import argparse
 import random
+import sys
 
-def print_board(board):
-    for row in board:
-        print(" | ".join(row))
-        print("-" * 9)
+from engine import GameState, RandomStrategy, print_board
+from engine.records import MAX_SEED, draw_seed, record_game
 
-def check_winner(board, player):
-    # Check rows and columns
-    for i in range(3):
-        if all(board[i][j] == player for j in range(3)) or all(board[j][i] == player for j in range(3)):
-            return True
-    # Check diagonals
-    if all(board[i][i] == player for i in range(3)) or all(board[i][2 - i] == player for i in range(3)):
-        return True
-    return False
-
-def get_available_moves(board):
-    return [(r, c) for r in range(3) for c in range(3) if board[r][c] == " "]
+strategy = RandomStrategy()
 
 def computer_move(board):
-    available_moves = get_available_moves(board)
-    return random.choice(available_moves)  # Random AI
-
-def is_full(board):
-    return all(cell != " " for row in board for cell in row)
+    return strategy.choose_move(board, "O", "X")  # Random AI
 
-def tic_tac_toe():
-    board = [[" " for _ in range(3)] for _ in range(3)]
+def tic_tac_toe(read_move=input):
+    state = GameState()
+    board = state.board
     player = "X"
     computer = "O"
     
@@ -34,7 +20,7 @@ def tic_tac_toe():
         print_board(board)
         
         # Player Move
-        move = input("Enter your move (1-9): ")
+        move = read_move("Enter your move (1-9): ")
         
         if not move.isdigit() or not (1 <= int(move) <= 9):
             print("Invalid input. Choose a number between 1-9.")
@@ -47,32 +33,53 @@ def tic_tac_toe():
             print("That spot is taken. Try again.")
             continue
         
-        board[row][col] = player
+        won = state.play(row, col, player)
         
-        if check_winner(board, player):
+        if won:
             print_board(board)
             print("Congratulations! You win!")
             break
         
-        if is_full(board):
+        if state.is_full():
             print_board(board)
             print("It's a draw!")
             break
         
         # Computer Move
         row, col = computer_move(board)
-        board[row][col] = computer
+        won = state.play(row, col, computer)
         print(f"Computer chose {row * 3 + col + 1}")
 
-        if check_winner(board, computer):
+        if won:
             print_board(board)
             print("Computer wins! Better luck next time.")
             break
         
-        if is_full(board):
+        if state.is_full():
             print_board(board)
             print("It's a draw!")
             break
 
+    return state
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the random computer.")
+    parser.add_argument("--seed", type=int, default=None, help="seed the computer's random choices to replay a game")
+    parser.add_argument("--record", metavar="FILE", help="append the finished game to this record file (see replay.py)")
+    args = parser.parse_args()
+    if args.seed is not None and not 0 <= args.seed <= MAX_SEED:
+        parser.error(f"--seed must be between 0 and {MAX_SEED}")
+    if args.record and args.seed is None:
+        args.seed = draw_seed()  # Stored with the record, so the game replays
+    if args.seed is not None:
+        strategy.rng = random.Random(args.seed)
+    try:
+        state = tic_tac_toe()
+    except EOFError:
+        print("\nGame stopped.", file=sys.stderr)
+        return
+    if args.record:
+        record_game(args.record, state.history, "human", "easy", args.seed)
+
 if __name__ == "__main__":
-    tic_tac_toe()
+    main()
@@ -0,0 +1,21 @@
+"""Shared Tic-Tac-Toe engine used by the console scripts, the GUI and the tools."""
+
+from .bitboard import Bitboard
+from .board import check_winner, get_available_moves, is_full, new_board, print_board
+from .difficulty import load_mistake_chance
+from .search import (AlphaBetaSearch, CachedSearch, FlatSearch, StateSearch, default_search, find_best_move,
+                     make_search, minimax)
+from .state import GameState
+from .strategies import (
+    STRATEGIES,
+    GradedStrategy,
+    MistakeStrategy,
+    PerfectStrategy,
+    RandomStrategy,
+    RuleBasedStrategy,
+    Strategy,
+    make_mistake,
+    make_rng,
+    make_strategy,
+)
+from .tablebase import Tablebase, default_tablebase
@@ -0,0 +1,27 @@
+import sys
+
+from . import perfect_table, retrograde, search
+
+USAGE = """usage: python -m engine <command> [options]
+
+commands:
+  table   rebuild the perfect-play table (--check cross-checks it against Minimax)
+  nodes   compare node counts of the searches on the empty board
+  graph   solve the full game graph backwards and write it (--check compares it with the table)
+"""
+
+
+def main(argv):
+    if not argv or argv[0] not in ("table", "nodes", "graph"):
+        print(USAGE, end="", file=sys.stderr)
+        return 2
+    if argv[0] == "table":
+        perfect_table.main(argv[1:], prog="python -m engine table")
+    elif argv[0] == "graph":
+        retrograde.main(argv[1:], prog="python -m engine graph")
+    else:
+        search.compare_node_counts()
+    return 0
+
+
+sys.exit(main(sys.argv[1:]))
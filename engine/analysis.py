@@ -0,0 +1,65 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from .board import check_winner
+from .retrograde import NOT_LEGAL, default_graph, side_to_move
+from .search import WIN_SCORE, AlphaBetaSearch
+
+# Position analysis: the value of every legal move, not just the best one.
+#
+# For any position of a game X opened with the right side to move, the answer
+# is read straight from the solved game graph (engine/retrograde.py): one
+# array lookup per move. Anything else (a game O opened, or the other side to
+# move) is scored once by AlphaBetaSearch with exact windows and cached, so
+# repeated calls cost a dictionary lookup.
+#
+# `value` is WIN, DRAW or LOSS for the side making the move and `distance` the
+# plies until the game ends under best play, counting the move itself (the
+# winner hurries, the loser stalls; a draw fills the board).
+
+WIN, DRAW, LOSS = 1, 0, -1
+CACHE_SIZE = 4096
+
+MoveValue = namedtuple("MoveValue", "move value distance")
+
+
+def analyze(board, mover=None):
+    """Returns a MoveValue for every legal move of `mover` (default: the side to move), row-major.
+
+    Returns [] for a finished game.
+    """
+    if mover is None:
+        mover = side_to_move(board)
+    graph = default_graph()
+    index = graph.index(board)
+    if index != NOT_LEGAL and side_to_move(board) == mover:
+        return [MoveValue(divmod(cell, 3), -graph.values[child], graph.distances[child] + 1)
+                for cell, child in sorted(graph.moves(index))]
+    return list(_searched("".join(cell for row in board for cell in row), mover))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _searched(cells, mover):
+    board = [list(cells[r * 3:r * 3 + 3]) for r in range(3)]
+    if check_winner(board, "X") or check_winner(board, "O"):
+        return ()
+    other = "O" if mover == "X" else "X"
+    empty = cells.count(" ")
+    moves = []
+    for move, score in sorted(AlphaBetaSearch().score_moves(board, mover, other)):
+        if score > 0:
+            moves.append(MoveValue(move, WIN, WIN_SCORE - score))
+        elif score < 0:
+            moves.append(MoveValue(move, LOSS, WIN_SCORE + score))
+        else:
+            moves.append(MoveValue(move, DRAW, empty))
+    return tuple(moves)
+
+
+def heatmap(board, mover=None):
+    """Returns a 3x3 grid holding each free cell's MoveValue (None for taken cells or a finished game)."""
+    grid = [[None] * 3 for _ in range(3)]
+    for move_value in analyze(board, mover):
+        row, col = move_value.move
+        grid[row][col] = move_value
+    return grid
@@ -0,0 +1,82 @@
+import numpy as np
+
+from .bitboard import WIN_MASKS
+from .perfect_table import NO_MOVE, POSITIONS, SIDES, default_table
+from .search import default_search
+
+# Batched move evaluation: best moves for many boards in one call.
+#
+# Boards are encoded as an (n, 9) array of cell codes, row-major, with
+# 0 = " ", 1 = "X", 2 = "O" (the same numbering as the perfect-play table).
+# Win detection runs over all 8 lines for every board at once and moves come
+# from a single gather into the perfect-play table. For any position reachable
+# in a game the result equals find_best_move; boards the table doesn't cover
+# fall back to the cached search one at a time.
+#
+# Needs NumPy, which the rest of the engine doesn't.
+
+MARK_CODES = {" ": 0, "X": 1, "O": 2}
+POW3 = 3 ** np.arange(8, -1, -1, dtype=np.int64)
+
+# (8, 3) cell indices of the winning lines
+LINES = np.array([[cell for cell in range(9) if mask >> cell & 1] for mask in WIN_MASKS], dtype=np.intp)
+
+
+def encode_boards(boards):
+    """Converts nested-list boards into an (n, 9) array of cell codes."""
+    return np.array([[MARK_CODES[cell] for row in board for cell in row] for board in boards], dtype=np.uint8)
+
+
+def decode_board(cells):
+    """Converts one row of cell codes back into a nested-list board."""
+    marks = [" XO"[code] for code in cells.tolist()]
+    return [marks[r * 3:r * 3 + 3] for r in range(3)]
+
+
+def winners(cells):
+    """Returns an (n,) array: 0 no winner, 1 X has a line, 2 O has a line."""
+    lines = cells[:, LINES]  # (n, 8, 3)
+    x_wins = (lines == 1).all(axis=2).any(axis=1)
+    o_wins = (lines == 2).all(axis=2).any(axis=1)
+    return np.where(x_wins, 1, np.where(o_wins, 2, 0))
+
+
+def best_moves(cells, computer="O", table=None):
+    """Returns (moves, scores) for `computer` to move on every board.
+
+    `moves` holds cell indices 0-8 (row, col = divmod(move, 3)) and `scores`
+    the Minimax score (1 win, 0 draw, -1 loss). Boards that are already won
+    or full get move -1 and score 0.
+    """
+    cells = np.asarray(cells, dtype=np.uint8).reshape(-1, 9)
+    table = default_table() if table is None else table
+    player = SIDES[1 - SIDES.index(computer)]
+
+    moves = np.full(len(cells), -1, dtype=np.int8)
+    scores = np.zeros(len(cells), dtype=np.int8)
+    live = (winners(cells) == 0) & (cells == 0).any(axis=1)
+
+    missing = live
+    if table is not None:
+        codes = cells.astype(np.int64) @ POW3
+        entries = np.frombuffer(table, dtype=np.uint8)[SIDES.index(computer) * POSITIONS + codes]
+        found = live & (entries != NO_MOVE)
+        moves[found] = entries[found] // 3
+        scores[found] = entries[found] % 3 - 1
+        missing = live & ~found
+
+    if missing.any():
+        search = default_search()
+        for index in np.flatnonzero(missing):
+            board = decode_board(cells[index])
+            (row, col), score = max(search.score_moves(board, computer, player),
+                                    key=lambda item: item[1])  # First move with the top score
+            moves[index] = row * 3 + col
+            scores[index] = score
+    return moves, scores
+
+
+def best_moves_for_boards(boards, computer="O"):
+    """Nested-list convenience wrapper: returns [(row, col) or None] and scores."""
+    moves, scores = best_moves(encode_boards(boards), computer)
+    return [None if move < 0 else divmod(int(move), 3) for move in moves], scores.tolist()
@@ -0,0 +1,112 @@
+# Compact Tic-Tac-Toe board: one 9-bit mask per player.
+#
+# Cell (row, col) is bit row * 3 + col. Wins, fullness and move generation are
+# answered from precomputed tables instead of scanning a nested list.
+
+FULL_MASK = 0b111111111
+
+# The 8 winning lines: 3 rows, 3 columns, 2 diagonals
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# Lookup tables indexed by a 9-bit mask
+WINNING = tuple(any(mask & line == line for line in WIN_MASKS) for mask in range(FULL_MASK + 1))
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(FULL_MASK + 1))
+
+# THREATS[mask]: the cells that would complete a line holding two of `mask`'s marks
+THREATS = tuple(
+    sum({line & ~mask for line in WIN_MASKS if POPCOUNT[mask & line] == 2})
+    for mask in range(FULL_MASK + 1)
+)
+
+# (row, col) for every cell index
+CELLS = tuple(divmod(cell, 3) for cell in range(9))
+
+
+def iter_bits(mask):
+    """Yields the index of each set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Bitboard:
+    """A 3x3 board stored as an X mask and an O mask."""
+
+    __slots__ = ("x", "o")
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    @classmethod
+    def from_board(cls, board):
+        """Builds a bitboard from a nested-list board of " ", "X" and "O"."""
+        x = o = 0
+        for r in range(3):
+            for c in range(3):
+                if board[r][c] == "X":
+                    x |= 1 << (r * 3 + c)
+                elif board[r][c] == "O":
+                    o |= 1 << (r * 3 + c)
+        return cls(x, o)
+
+    def to_board(self):
+        """Returns the equivalent nested-list board."""
+        board = [[" " for _ in range(3)] for _ in range(3)]
+        for cell in iter_bits(self.x):
+            r, c = CELLS[cell]
+            board[r][c] = "X"
+        for cell in iter_bits(self.o):
+            r, c = CELLS[cell]
+            board[r][c] = "O"
+        return board
+
+    def copy(self):
+        return Bitboard(self.x, self.o)
+
+    def mask(self, player):
+        """Returns the mask of cells held by a player."""
+        return self.x if player == "X" else self.o
+
+    def empty_mask(self):
+        """Returns the mask of empty cells."""
+        return FULL_MASK ^ (self.x | self.o)
+
+    def place(self, player, row, col):
+        """Puts a player's mark on an empty cell."""
+        if player == "X":
+            self.x |= 1 << (row * 3 + col)
+        else:
+            self.o |= 1 << (row * 3 + col)
+
+    def clear(self, row, col):
+        """Empties a cell (undo a move)."""
+        bit = ~(1 << (row * 3 + col))
+        self.x &= bit
+        self.o &= bit
+
+    def check_winner(self, player):
+        """Checks if a player has won."""
+        return WINNING[self.x if player == "X" else self.o]
+
+    def is_full(self):
+        """Checks if the board is full."""
+        return POPCOUNT[self.x | self.o] == 9
+
+    def get_available_moves(self):
+        """Returns available moves as (row, col) pairs, in row-major order."""
+        return [CELLS[cell] for cell in iter_bits(self.empty_mask())]
+
+    def __eq__(self, other):
+        return isinstance(other, Bitboard) and self.x == other.x and self.o == other.o
+
+    def __hash__(self):
+        return hash((self.x, self.o))
+
+    def __repr__(self):
+        return f"Bitboard(x={self.x:#011b}, o={self.o:#011b})"
@@ -0,0 +1,33 @@
+# Helpers for the nested-list board the games use: 3 rows of " ", "X" or "O".
+
+
+def new_board():
+    """Returns an empty board."""
+    return [[" " for _ in range(3)] for _ in range(3)]
+
+
+def print_board(board):
+    """Prints the Tic-Tac-Toe board in a readable format."""
+    for row in board:
+        print(" | ".join(row))
+        print("-" * 9)
+
+
+def check_winner(board, player):
+    """Checks if a player has won the game."""
+    for i in range(3):
+        if all(board[i][j] == player for j in range(3)) or all(board[j][i] == player for j in range(3)):
+            return True
+    if all(board[i][i] == player for i in range(3)) or all(board[i][2 - i] == player for i in range(3)):
+        return True
+    return False
+
+
+def get_available_moves(board):
+    """Finds all empty spaces on the board."""
+    return [(r, c) for r in range(3) for c in range(3) if board[r][c] == " "]
+
+
+def is_full(board):
+    """Checks if the board is full (draw condition)."""
+    return all(cell != " " for row in board for cell in row)
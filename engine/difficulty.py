@@ -0,0 +1,35 @@
+import json
+import os
+
+# Shared difficulty settings for choose-level.py and choose-level-with-gui.py.
+#
+# difficulty.json is written by calibrate.py; these defaults are only used if
+# the file is missing.
+
+DIFFICULTY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "difficulty.json")
+
+DEFAULT_MISTAKE_CHANCE = {
+    "easy": 0.5,
+    "medium": 0.2,
+    "hard": 0.05,
+}
+
+
+def load_mistake_chance(path=DIFFICULTY_FILE):
+    """Returns the mistake chance for each difficulty level."""
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return dict(DEFAULT_MISTAKE_CHANCE)
+    return {level: float(chance) for level, chance in config["mistake_chance"].items()}
+
+
+def save_config(mistake_chance, calibration=None, path=DIFFICULTY_FILE):
+    """Writes the shared difficulty config (with optional calibration details)."""
+    config = {"mistake_chance": mistake_chance}
+    if calibration is not None:
+        config["calibration"] = calibration
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,245 @@
+import cProfile
+import pstats
+import sys
+import time
+
+from .bitboard import POPCOUNT
+from .search import AlphaBetaSearch, CachedSearch, FlatSearch, StateSearch
+from .strategies import Strategy
+
+# Opt-in instrumentation for the console games (--stats / --profile).
+#
+# The profiled searches are subclasses, so the plain ones the games use by
+# default pay nothing. They add the deepest ply reached and per-root-move
+# timings to the usual node and cache counters. InstrumentedStrategy wraps a
+# strategy and records one entry per computer move, including whether the
+# optimal or the mistake path was taken and where the move came from
+# (perfect-play table, tablebase, search or make_mistake's rules).
+
+
+class ProfiledCachedSearch(CachedSearch):
+    """CachedSearch that also tracks max depth and time per root move."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.root_filled = 0
+        self.max_depth = 0
+        self.root_moves = []
+
+    def _value(self, mine, theirs):
+        depth = POPCOUNT[mine | theirs] - self.root_filled
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return super()._value(mine, theirs)
+
+    def _root_score(self, cell, mine, theirs):
+        self.root_filled = POPCOUNT[mine | theirs]
+        nodes = self.nodes
+        started = time.perf_counter()
+        score = super()._root_score(cell, mine, theirs)
+        self.root_moves.append(_root_move(cell, score, self.nodes - nodes, started))
+        return score
+
+    def stats(self):
+        return {**super().stats(), "max_depth": self.max_depth}
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.max_depth = 0
+        self.root_moves = []
+
+
+class ProfiledAlphaBetaSearch(AlphaBetaSearch):
+    """AlphaBetaSearch that also tracks max depth and time per root move."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_depth = 0
+        self.root_moves = []
+
+    def _negamax(self, mine, theirs, depth, alpha, beta):
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return super()._negamax(mine, theirs, depth, alpha, beta)
+
+    def _root_score(self, cell, mine, theirs, alpha, beta):
+        nodes = self.nodes
+        started = time.perf_counter()
+        score = super()._root_score(cell, mine, theirs, alpha, beta)
+        self.root_moves.append(_root_move(cell, score, self.nodes - nodes, started))
+        return score
+
+    def stats(self):
+        return {**super().stats(), "max_depth": self.max_depth}
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.max_depth = 0
+        self.root_moves = []
+
+
+class ProfiledFlatSearch(FlatSearch):
+    """FlatSearch that also tracks time per root move (its loop has no per-node hook for depth)."""
+
+    def __init__(self):
+        super().__init__()
+        self.root_moves = []
+
+    def _score(self, cell, filled, floor=-2):
+        nodes = self.nodes
+        started = time.perf_counter()
+        score = super()._score(cell, filled, floor)
+        self.root_moves.append(_root_move(cell, score, self.nodes - nodes, started))
+        return score
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.root_moves = []
+
+
+class ProfiledStateSearch(StateSearch):
+    """StateSearch that also tracks time per root move."""
+
+    def __init__(self):
+        super().__init__()
+        self.root_moves = []
+
+    def _root_score(self, state, cell, computer, player, floor=-2):
+        nodes = self.nodes
+        started = time.perf_counter()
+        score = super()._root_score(state, cell, computer, player, floor)
+        self.root_moves.append(_root_move(cell, score, self.nodes - nodes, started))
+        return score
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.root_moves = []
+
+
+def _root_move(cell, score, nodes, started):
+    return {"move": cell + 1, "score": score, "nodes": nodes,
+            "ms": round((time.perf_counter() - started) * 1000, 3)}
+
+
+PROFILED_SEARCHES = {
+    "minimax": ProfiledCachedSearch,
+    "alphabeta": ProfiledAlphaBetaSearch,
+    "flat": ProfiledFlatSearch,
+    "state": ProfiledStateSearch,
+}
+
+
+def make_profiled_search(mode="minimax", **options):
+    """Creates the profiled version of a search mode from engine.search.SEARCH_MODES."""
+    if mode not in PROFILED_SEARCHES:
+        raise ValueError(f"Unknown search mode {mode!r}; choose from {', '.join(PROFILED_SEARCHES)}")
+    return PROFILED_SEARCHES[mode](**options)
+
+
+class InstrumentedStrategy(Strategy):
+    """Wraps a strategy and records stats for every move it picks."""
+
+    def __init__(self, strategy, verbose=False, out=None):
+        self.strategy = strategy
+        self.name = strategy.name
+        self.verbose = verbose
+        self.out = out or sys.stderr
+        self.records = []
+
+    def choose_move(self, board, computer, player):
+        search = getattr(self.strategy, "search", None)
+        if search is not None:
+            search.reset_stats()
+        started = time.perf_counter()
+        row, col = self.strategy.choose_move(board, computer, player)
+        record = {
+            "turn": len(self.records) + 1,
+            "move": row * 3 + col + 1,
+            "path": self.strategy.last_path,
+            "source": self.strategy.last_source,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        if search is not None:
+            record.update(search.stats())
+            record["root_moves"] = list(getattr(search, "root_moves", []))
+        self.records.append(record)
+        if self.verbose:
+            print(format_record(record), file=self.out)
+        return row, col
+
+    def summary(self):
+        """Totals over every recorded move."""
+        return {
+            "moves": len(self.records),
+            "ms": round(sum(record["ms"] for record in self.records), 3),
+            "nodes": sum(record.get("nodes", 0) for record in self.records),
+            "hits": sum(record.get("hits", 0) for record in self.records),
+            "max_depth": max((record.get("max_depth", 0) for record in self.records), default=0),
+            "mistakes": sum(1 for record in self.records if record["path"] == "mistake"),
+        }
+
+    def report(self):
+        """Prints the totals."""
+        summary = self.summary()
+        print(f"{summary['moves']} computer moves in {summary['ms']:.3f} ms: {summary['nodes']} nodes, "
+              f"{summary['hits']} cache hits, max depth {summary['max_depth']}, {summary['mistakes']} mistakes",
+              file=self.out)
+
+
+def format_record(record):
+    """One line per move, then one indented line per root move searched."""
+    line = (f"[move {record['turn']}] cell {record['move']}  {record['path']} via {record['source']}  "
+            f"{record['ms']:.3f} ms")
+    if "nodes" in record:
+        line += f"  nodes {record['nodes']}  max depth {record.get('max_depth', '?')}"
+    if "hits" in record:
+        line += f"  cache hits {record['hits']} / misses {record['misses']}"
+    for root in record.get("root_moves", ()):
+        line += f"\n    root {root['move']}: score {root['score']:+d}  nodes {root['nodes']}  {root['ms']:.3f} ms"
+    return line
+
+
+def scripted_input(moves):
+    """Returns an input() replacement that plays `moves` ("5,1,9") and then ends the game."""
+    pending = iter(moves.split(","))
+
+    def read_move(prompt=""):
+        try:
+            move = next(pending).strip()
+        except StopIteration:
+            raise EOFError("No scripted moves left") from None
+        print(prompt + move)
+        return move
+
+    return read_move
+
+
+def add_arguments(parser):
+    """Adds the shared --stats / --profile / --moves / --no-table / --record options to a game's parser."""
+    parser.add_argument("--stats", action="store_true", help="print per-move search stats to stderr")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run the game under cProfile and write the stats to FILE "
+                             "(open with snakeviz, or flameprof for a flame graph)")
+    parser.add_argument("--moves", help="play these cells for X instead of asking, e.g. 5,1,9")
+    parser.add_argument("--no-table", action="store_true",
+                        help="ignore the precomputed tables so every move is searched")
+    parser.add_argument("--record", metavar="FILE", help="append the finished game to this record file (see replay.py)")
+
+
+def run_game(play, args):
+    """Runs play(read_move) as the flags ask and returns its result, or None when scripted moves run out."""
+    read_move = scripted_input(args.moves) if args.moves else input
+    try:
+        if args.profile:
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(play, read_move)
+            finally:
+                profiler.dump_stats(args.profile)
+                stats = pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative")
+                stats.print_stats(15)
+                print(f"Profile written to {args.profile}", file=sys.stderr)
+        return play(read_move)
+    except EOFError:
+        print("\nGame stopped.", file=sys.stderr)
+        return None
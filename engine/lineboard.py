@@ -0,0 +1,121 @@
+from functools import lru_cache
+
+# N x N board with K-in-a-row lines, shared by kinarow.py and the MCTS engine.
+#
+# The board keeps a per-line count of each player's marks for every window of
+# K cells, updated on each move, so wins and the heuristic score never need a
+# rescan.
+
+
+@lru_cache(maxsize=None)
+def _lines(size, win_length):
+    """Returns every K-cell window as a tuple of cell indices, plus the windows through each cell."""
+    lines = []
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r = r + dr * (win_length - 1)
+                end_c = c + dc * (win_length - 1)
+                if 0 <= end_r < size and 0 <= end_c < size:
+                    lines.append(tuple((r + dr * i) * size + c + dc * i for i in range(win_length)))
+    cell_lines = [[] for _ in range(size * size)]
+    for index, line in enumerate(lines):
+        for cell in line:
+            cell_lines[cell].append(index)
+    return tuple(lines), tuple(tuple(indices) for indices in cell_lines)
+
+
+class LineBoard:
+    """An N x N board with incrementally maintained line counts."""
+
+    def __init__(self, size=3, win_length=3):
+        if not 1 <= win_length <= size:
+            raise ValueError(f"Win length must be between 1 and {size}")
+        self.size = size
+        self.win_length = win_length
+        self.cells = [" "] * (size * size)
+        self.lines, self.cell_lines = _lines(size, win_length)
+        self.counts = {"X": [0] * len(self.lines), "O": [0] * len(self.lines)}
+        self.weights = tuple(0 if n == 0 else 10 ** n for n in range(win_length + 1))
+        self.empty = size * size
+        self.winner = None
+        self.score = 0  # Heuristic score from X's point of view
+        self.history = []
+
+    @classmethod
+    def from_board(cls, board, win_length=None):
+        """Builds a line board from a nested-list board of " ", "X" and "O"."""
+        size = len(board)
+        line_board = cls(size, win_length or min(size, 5))
+        for r in range(size):
+            for c in range(size):
+                if board[r][c] != " ":
+                    line_board.play(r * size + c, board[r][c])
+        return line_board
+
+    def to_board(self):
+        """Returns the equivalent nested-list board."""
+        return [self.cells[r * self.size:(r + 1) * self.size] for r in range(self.size)]
+
+    def _line_value(self, line):
+        x = self.counts["X"][line]
+        o = self.counts["O"][line]
+        if o == 0:
+            return self.weights[x]
+        if x == 0:
+            return -self.weights[o]
+        return 0  # Blocked line
+
+    def play(self, cell, player):
+        """Places a mark and updates line counts, score and winner."""
+        counts = self.counts[player]
+        for line in self.cell_lines[cell]:
+            self.score -= self._line_value(line)
+            counts[line] += 1
+            self.score += self._line_value(line)
+            if counts[line] == self.win_length:
+                self.winner = player
+        self.cells[cell] = player
+        self.empty -= 1
+        self.history.append(cell)
+
+    def undo(self):
+        """Takes back the last move."""
+        cell = self.history.pop()
+        counts = self.counts[self.cells[cell]]
+        for line in self.cell_lines[cell]:
+            self.score -= self._line_value(line)
+            counts[line] -= 1
+            self.score += self._line_value(line)
+        self.cells[cell] = " "
+        self.empty += 1
+        self.winner = None  # Play stops at the first win, so only the last move can have won
+
+    def is_full(self):
+        return self.empty == 0
+
+    def get_available_moves(self):
+        """Returns the empty cells."""
+        return [cell for cell, mark in enumerate(self.cells) if mark == " "]
+
+    def candidate_moves(self):
+        """Returns empty cells next to an existing mark (or the center on an empty board)."""
+        if self.empty == len(self.cells):
+            return [(self.size // 2) * self.size + self.size // 2]
+        if self.size <= 4:
+            return self.get_available_moves()
+        size = self.size
+        candidates = set()
+        for cell in self.history:
+            r, c = divmod(cell, size)
+            for nr in range(max(r - 1, 0), min(r + 2, size)):
+                for nc in range(max(c - 1, 0), min(c + 2, size)):
+                    if self.cells[nr * size + nc] == " ":
+                        candidates.add(nr * size + nc)
+        return sorted(candidates)
+
+    def activity(self, cell):
+        """How many marks share a line with this cell (used for move ordering)."""
+        x = self.counts["X"]
+        o = self.counts["O"]
+        return sum(x[line] * x[line] + o[line] * o[line] for line in self.cell_lines[cell])
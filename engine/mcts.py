@@ -0,0 +1,215 @@
+import concurrent.futures
+import math
+import random
+
+from .lineboard import LineBoard
+from .strategies import STRATEGIES, Strategy, make_rng
+
+# Monte Carlo Tree Search (UCT) for N x N, K-in-a-row boards.
+#
+# Each playout walks down the tree by UCB1, adds one node, finishes the game
+# with random moves and backs the result up the path. Strength scales with the
+# playout budget rather than the size of the game tree, so the same strategy
+# plays 3x3 and 15x15. Between turns the subtree under the move actually
+# played is kept and searched further. With workers > 1 the playouts are split
+# across a process pool instead: every worker grows its own tree from the
+# current position and the root statistics are added up (no tree reuse then).
+
+DEFAULT_PLAYOUTS = 1000
+EXPLORATION = math.sqrt(2)
+
+# Playouts per difficulty level
+PLAYOUTS = {
+    "easy": 20,
+    "medium": 150,
+    "hard": 2000,
+}
+
+
+class Node:
+    """One position in the search tree, reached by `player` playing `move`."""
+
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, player, parent, untried):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = {}
+        self.untried = untried  # Moves not expanded yet
+        self.visits = 0
+        self.wins = 0.0  # From `player`'s point of view: 1 per win, 0.5 per draw
+
+
+def _other(player):
+    return "O" if player == "X" else "X"
+
+
+def _untried(board, rng):
+    if board.winner is not None or board.is_full():
+        return []
+    moves = board.candidate_moves()
+    rng.shuffle(moves)
+    return moves
+
+
+def _select(node, exploration):
+    log_visits = math.log(node.visits)
+    best = None
+    best_value = -1.0
+    for child in node.children.values():
+        value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        if value > best_value:
+            best = child
+            best_value = value
+    return best
+
+
+def _playout(board, player, rng):
+    """Plays random moves to the end; returns the winner (None for a draw). Leaves the moves on the board."""
+    if board.winner is not None:
+        return board.winner
+    moves = board.get_available_moves()
+    rng.shuffle(moves)
+    for cell in moves:
+        board.play(cell, player)
+        if board.winner is not None:
+            return player
+        player = _other(player)
+    return None
+
+
+def search_tree(root, board, playouts, exploration=EXPLORATION, rng=random):
+    """Runs `playouts` playouts from `root`, whose position is on `board`, drawing from `rng`."""
+    for _ in range(playouts):
+        node = root
+        played = len(board.history)
+
+        # Selection
+        while not node.untried and node.children:
+            node = _select(node, exploration)
+            board.play(node.move, node.player)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            player = _other(node.player)
+            board.play(move, player)
+            child = Node(move, player, node, _untried(board, rng))
+            node.children[move] = child
+            node = child
+
+        # Simulation
+        winner = _playout(board, _other(node.player), rng)
+        while len(board.history) > played:
+            board.undo()
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1
+            node = node.parent
+
+
+def _root_stats(cells, size, win_length, computer, playouts, exploration, seed):
+    """Runs in a pool worker: searches a fresh tree; returns {move: (visits, wins)} at the root."""
+    rng = random.Random(seed)
+    board = _line_board(cells, size, win_length)
+    root = Node(None, _other(computer), None, _untried(board, rng))
+    search_tree(root, board, playouts, exploration, rng)
+    return {move: (child.visits, child.wins) for move, child in root.children.items()}
+
+
+def _line_board(cells, size, win_length):
+    board = LineBoard(size, win_length)
+    for cell, mark in enumerate(cells):
+        if mark != " ":
+            board.play(cell, mark)
+    return board
+
+
+class MCTSStrategy(Strategy):
+    """UCT search with a playout budget; works on any N x N board.
+
+    `win_length` defaults to min(N, 5) like kinarow.py. With workers > 1 the
+    playouts run in a process pool; call close() to shut it down.
+    """
+
+    name = "mcts"
+    last_path = "optimal"
+    last_source = "mcts"
+
+    def __init__(self, playouts=DEFAULT_PLAYOUTS, exploration=EXPLORATION, win_length=None, reuse_tree=True,
+                 workers=1, rng=None):
+        self.playouts = playouts
+        self.exploration = exploration
+        self.win_length = win_length
+        self.reuse_tree = reuse_tree
+        self.workers = workers
+        self.rng = make_rng(rng)
+        self.executor = None
+        self.root = None  # Subtree kept from the last move
+        self.root_cells = None  # Position at self.root
+
+    def choose_move(self, board, computer, player):
+        size = len(board)
+        win_length = self.win_length or min(size, 5)
+        cells = [mark for row in board for mark in row]
+        position = _line_board(cells, size, win_length)
+        if position.winner is not None or position.is_full():
+            return None  # Nothing to play
+        if self.workers > 1:
+            move = self._parallel_move(cells, size, win_length, computer)
+        else:
+            move = self._tree_move(position, cells, computer)
+        return divmod(move, size)
+
+    def _reused_root(self, cells, computer):
+        """Returns the kept subtree if `cells` is its position plus one opponent move, else None."""
+        if not self.reuse_tree or self.root is None or len(cells) != len(self.root_cells):
+            return None
+        changed = [cell for cell, (old, new) in enumerate(zip(self.root_cells, cells)) if old != new]
+        if len(changed) != 1 or self.root_cells[changed[0]] != " " or cells[changed[0]] != _other(computer):
+            return None
+        return self.root.children.get(changed[0])
+
+    def _tree_move(self, board, cells, computer):
+        root = self._reused_root(cells, computer)
+        if root is None:
+            root = Node(None, _other(computer), None, _untried(board, self.rng))
+        root.parent = None  # Let the rest of the old tree go
+        search_tree(root, board, self.playouts, self.exploration, self.rng)
+
+        best = max(root.children.values(), key=lambda child: child.visits)
+        if self.reuse_tree:
+            self.root = best
+            self.root_cells = list(cells)
+            self.root_cells[best.move] = computer
+        return best.move
+
+    def _parallel_move(self, cells, size, win_length, computer):
+        if self.executor is None:
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+        share, extra = divmod(self.playouts, self.workers)
+        futures = [
+            self.executor.submit(_root_stats, cells, size, win_length, computer, share + (index < extra),
+                                 self.exploration, self.rng.getrandbits(64))
+            for index in range(self.workers)
+        ]
+        visits = {}
+        for future in futures:
+            for move, (count, _) in future.result().items():
+                visits[move] = visits.get(move, 0) + count
+        return max(visits, key=visits.get)
+
+    def close(self):
+        """Shuts down the process pool, if one was started."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+STRATEGIES[MCTSStrategy.name] = MCTSStrategy
@@ -0,0 +1,162 @@
+import argparse
+import os
+
+from .board import check_winner, get_available_moves
+
+# Precomputed perfect-play table for 3x3 Tic-Tac-Toe.
+#
+# Every position is numbered in base 3 (row-major, " " = 0, "X" = 1, "O" = 2).
+# The table holds one byte per (side to move, position): move * 3 + (score + 1),
+# or NO_MOVE for positions that are terminal or can't be reached in a game.
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfect_table.bin")
+
+POSITIONS = 3 ** 9
+SIDES = ("X", "O")
+MARKS = {" ": 0, "X": 1, "O": 2}
+NO_MOVE = 255
+
+
+def encode(board):
+    """Converts a board into its base-3 position number."""
+    code = 0
+    for row in board:
+        for cell in row:
+            code = code * 3 + MARKS[cell]
+    return code
+
+
+def solve(board, turn, other, table, values):
+    """Solves a position for the side to move and records its best move.
+
+    Returns the value of the position for `turn`: 1 win, 0 draw, -1 loss.
+    """
+    code = encode(board)
+    index = SIDES.index(turn) * POSITIONS + code
+    if index in values:
+        return values[index]
+
+    if check_winner(board, other):
+        value = -1  # The previous move won
+    else:
+        moves = get_available_moves(board)
+        if not moves:
+            value = 0  # It's a draw
+        else:
+            # Same tie-break as find_best_move: first move (row-major) with the top score
+            value = -2
+            best_move = None
+            for row, col in moves:
+                board[row][col] = turn
+                score = -solve(board, other, turn, table, values)
+                board[row][col] = " "  # Undo move
+                if score > value:
+                    value = score
+                    best_move = (row, col)
+            table[index] = (best_move[0] * 3 + best_move[1]) * 3 + value + 1
+
+    values[index] = value
+    return value
+
+
+def build_table():
+    """Enumerates every reachable position once and solves it."""
+    table = bytearray([NO_MOVE]) * (len(SIDES) * POSITIONS)
+    values = {}
+    board = [[" " for _ in range(3)] for _ in range(3)]
+    solve(board, "X", "O", table, values)
+    solve(board, "O", "X", table, values)  # Games where O opens
+    return table
+
+
+def save_table(table, path=TABLE_FILE):
+    """Writes the table to disk."""
+    with open(path, "wb") as f:
+        f.write(table)
+
+
+def load_table(path=TABLE_FILE):
+    """Loads the table from disk, or returns None if it's missing or invalid."""
+    try:
+        with open(path, "rb") as f:
+            table = f.read()
+    except OSError:
+        return None
+    if len(table) != len(SIDES) * POSITIONS:
+        return None
+    return table
+
+
+_default_table = False  # Not loaded yet
+
+
+def default_table():
+    """Returns the table from TABLE_FILE, loaded once per process (None if missing)."""
+    global _default_table
+    if _default_table is False:
+        _default_table = load_table()
+    return _default_table
+
+
+def lookup(table, board, computer):
+    """Returns ((row, col), score) for `computer` to move, or None if the position isn't in the table."""
+    if computer not in SIDES:
+        return None
+    entry = table[SIDES.index(computer) * POSITIONS + encode(board)]
+    if entry == NO_MOVE:
+        return None
+    move, score = divmod(entry, 3)
+    return divmod(move, 3), score - 1
+
+
+def cross_check(table):
+    """Compares every table entry against the plain Minimax search."""
+    from .search import find_best_move, minimax
+
+    checked = 0
+    for index, entry in enumerate(table):
+        if entry == NO_MOVE:
+            continue
+        side, code = divmod(index, POSITIONS)
+        computer = SIDES[side]
+        player = SIDES[1 - side]
+        cells = []
+        for _ in range(9):
+            code, mark = divmod(code, 3)
+            cells.append(" XO"[mark])
+        cells.reverse()
+        board = [cells[r * 3:r * 3 + 3] for r in range(3)]
+
+        (row, col), score = lookup(table, board, computer)
+        expected = find_best_move(board, computer, player)
+        if (row, col) != expected:
+            raise AssertionError(f"{computer} to move on {cells}: table {(row, col)}, Minimax {expected}")
+        board[row][col] = computer
+        expected_score = minimax(board, 0, False, computer, player)
+        if score != expected_score:
+            raise AssertionError(f"{computer} to move on {cells}: table score {score}, Minimax {expected_score}")
+        checked += 1
+    return checked
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Build the perfect-play lookup table.")
+    parser.add_argument("--output", default=TABLE_FILE, help="where to write the table")
+    parser.add_argument("--tablebase-output", default=None,
+                        help="where to write the pickled tablebase (default: engine/tablebase.pickle)")
+    parser.add_argument("--check", action="store_true", help="cross-check every entry against live Minimax")
+    args = parser.parse_args(argv)
+
+    from .tablebase import TABLEBASE_FILE, Tablebase, save_tablebase
+
+    table = build_table()
+    save_table(table, args.output)
+    solved = sum(1 for entry in table if entry != NO_MOVE)
+    print(f"Solved {solved} positions, wrote {len(table)} bytes to {args.output}")
+
+    tablebase_output = args.tablebase_output or TABLEBASE_FILE
+    save_tablebase(Tablebase(table), table, tablebase_output)
+    print(f"Wrote the tablebase to {tablebase_output}")
+
+    if args.check:
+        print(f"Cross-checked {cross_check(table)} positions against Minimax")
@@ -0,0 +1,174 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+# Compact binary game records.
+#
+# A file starts with MAGIC and holds a stream of records, each starting with a
+# type byte:
+#   STRATEGY: u8 id, u8 name length, name (UTF-8), which defines a strategy id
+#   GAME:     u8 flags, u8 X strategy id, u8 O strategy id,
+#             u16 X difficulty, u16 O difficulty (mistake chance x 10000, or
+#             NO_DIFFICULTY), u64 seed, u8 move count, then one byte per move
+#             (cell 0-8)
+# Multi-byte fields are little-endian. Flag bit 0 means O moved first.
+#
+# simulate.py --record appends games in bulk through GameWriter; the console
+# scripts and the GUI append each finished game against a human with
+# record_game (X is "human").
+
+MAGIC = b"TTTR\x01"
+STRATEGY = 1
+GAME = 2
+O_FIRST = 1
+NO_DIFFICULTY = 0xFFFF
+MAX_SEED = (1 << 64) - 1
+
+GAME_HEADER = struct.Struct("<BBBBHHQB")
+BUFFER_SIZE = 1 << 20
+MMAP_THRESHOLD = 1 << 20  # Files at least this big are memory-mapped
+
+GameRecord = namedtuple("GameRecord", "x_strategy o_strategy x_difficulty o_difficulty seed first moves")
+
+
+class RecordError(ValueError):
+    pass
+
+
+def _encode_difficulty(difficulty):
+    return NO_DIFFICULTY if difficulty is None else round(difficulty * 10000)
+
+
+def _decode_difficulty(level):
+    return None if level == NO_DIFFICULTY else level / 10000
+
+
+def encode_game(moves, x_id, o_id, seed=0, x_difficulty=None, o_difficulty=None, first="X"):
+    """Encodes one game record; `moves` are cell indices 0-8 in play order."""
+    flags = O_FIRST if first == "O" else 0
+    return GAME_HEADER.pack(GAME, flags, x_id, o_id, _encode_difficulty(x_difficulty),
+                            _encode_difficulty(o_difficulty), seed, len(moves)) + bytes(moves)
+
+
+class GameWriter:
+    """Appends game records to a file through a large write buffer."""
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.strategy_ids = {}
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            # Appending: carry on with the ids the file already defines
+            for record_type, value in _iter_file(path):
+                if record_type == STRATEGY:
+                    self.strategy_ids[value[1]] = value[0]
+        self.file = open(path, "ab", buffering=buffer_size)
+        if new_file:
+            self.file.write(MAGIC)
+
+    def strategy_id(self, name):
+        """Returns the id for a strategy name, defining it in the file on first use."""
+        if name not in self.strategy_ids:
+            strategy_id = len(self.strategy_ids)
+            if strategy_id > 255:
+                raise RecordError("A record file holds at most 256 strategies")
+            encoded = name.encode()
+            self.file.write(bytes([STRATEGY, strategy_id, len(encoded)]) + encoded)
+            self.strategy_ids[name] = strategy_id
+        return self.strategy_ids[name]
+
+    def write_game(self, moves, x_strategy, o_strategy, seed=0, x_difficulty=None, o_difficulty=None, first="X"):
+        x_id = self.strategy_id(x_strategy)
+        o_id = self.strategy_id(o_strategy)
+        self.file.write(encode_game(moves, x_id, o_id, seed, x_difficulty, o_difficulty, first))
+
+    def write_encoded(self, data):
+        """Appends records already built with encode_game (ids from strategy_id)."""
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record_game(path, moves, x_strategy, o_strategy, seed=0, x_difficulty=None, o_difficulty=None, first="X"):
+    """Appends one finished game to a record file, opening and closing it around the write."""
+    with GameWriter(path) as writer:
+        writer.write_game(moves, x_strategy, o_strategy, seed, x_difficulty, o_difficulty, first)
+
+
+def draw_seed():
+    """Returns a fresh seed for a game that is recorded without one."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+def _records(data):
+    """Yields (type, value) for every record in a buffer that starts with MAGIC."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise RecordError("Not a game record file")
+    offset = len(MAGIC)
+    end = len(data)
+    while offset < end:
+        record_type = data[offset]
+        if record_type == STRATEGY:
+            strategy_id, length = data[offset + 1], data[offset + 2]
+            name = bytes(data[offset + 3:offset + 3 + length]).decode()
+            offset += 3 + length
+            yield STRATEGY, (strategy_id, name)
+        elif record_type == GAME:
+            if offset + GAME_HEADER.size > end:
+                raise RecordError(f"Truncated game record at byte {offset}")
+            _, flags, x_id, o_id, x_level, o_level, seed, count = GAME_HEADER.unpack_from(data, offset)
+            offset += GAME_HEADER.size
+            if offset + count > end:
+                raise RecordError(f"Truncated game record at byte {offset}")
+            yield GAME, (flags, x_id, o_id, x_level, o_level, seed, bytes(data[offset:offset + count]))
+            offset += count
+        else:
+            raise RecordError(f"Unknown record type {record_type} at byte {offset}")
+
+
+def _iter_file(path, use_mmap=None):
+    """Yields (type, value) for every record in a file, memory-mapping large files."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= MMAP_THRESHOLD
+        if use_mmap and size:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+        try:
+            yield from _records(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def read_games(path, use_mmap=None):
+    """Yields a GameRecord for every game in a file.
+
+    Large files are memory-mapped rather than read into memory (pass use_mmap
+    to force either way).
+    """
+    names = {}
+    for record_type, value in _iter_file(path, use_mmap):
+        if record_type == STRATEGY:
+            names[value[0]] = value[1]
+            continue
+        flags, x_id, o_id, x_level, o_level, seed, moves = value
+        yield GameRecord(
+            names[x_id],
+            names[o_id],
+            _decode_difficulty(x_level),
+            _decode_difficulty(o_level),
+            seed,
+            "O" if flags & O_FIRST else "X",
+            moves,
+        )
@@ -0,0 +1,242 @@
+import argparse
+import os
+from array import array
+from collections import deque
+
+from .board import check_winner, is_full
+from .perfect_table import MARKS, POSITIONS, SIDES, default_table, encode
+
+# Retrograde solver: the whole 3x3 game graph, solved backwards.
+#
+# Every legal position of a game X opens (5,478 of them) is enumerated once
+# and numbered 0..n-1 in order of its base-3 code, so GameGraph.rank[code] is
+# a perfect hash of legal positions. The successor graph is stored in CSR form
+# (offsets/successors/cells), terminal positions are found with check_winner
+# and is_full, and results are propagated from them backwards: a position is
+# won if some move reaches a lost position, lost if every move reaches a won
+# one, and drawn otherwise. `distance` is the number of plies to the end of the
+# game under best play (the winner hurries, the loser stalls).
+#
+# `python -m engine graph` writes the arrays to GRAPH_FILE, which
+# default_graph() loads.
+
+GRAPH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_graph.bin")
+MAGIC = b"TTTG\x01"
+
+WIN, DRAW, LOSS = 1, 0, -1
+NOT_LEGAL = -1
+
+
+def _decode(code):
+    board = []
+    for _ in range(9):
+        code, mark = divmod(code, 3)
+        board.append(" XO"[mark])
+    board.reverse()
+    return [board[r * 3:r * 3 + 3] for r in range(3)]
+
+
+def side_to_move(board):
+    """Returns the side to move in a game X opened."""
+    cells = [cell for row in board for cell in row]
+    return "X" if cells.count("X") == cells.count("O") else "O"
+
+
+class GameGraph:
+    """The solved game graph as dense arrays indexed by position number."""
+
+    def __init__(self, codes, offsets, successors, cells, values, distances):
+        self.codes = codes  # Position number -> base-3 code
+        self.offsets = offsets  # Moves of position i are successors[offsets[i]:offsets[i + 1]]
+        self.successors = successors
+        self.cells = cells  # Cell (0-8) played along each edge
+        self.values = values  # For the side to move: WIN, DRAW or LOSS
+        self.distances = distances
+        self.rank = array("h", [NOT_LEGAL]) * POSITIONS  # Base-3 code -> position number
+        for index, code in enumerate(codes):
+            self.rank[code] = index
+
+    def __len__(self):
+        return len(self.codes)
+
+    def index(self, board):
+        """Returns the position number of a board, or NOT_LEGAL."""
+        return self.rank[encode(board)]
+
+    def board(self, index):
+        """Returns the nested-list board of a position number."""
+        return _decode(self.codes[index])
+
+    def moves(self, index):
+        """Yields (cell, successor position number) for every move from a position."""
+        for edge in range(self.offsets[index], self.offsets[index + 1]):
+            yield self.cells[edge], self.successors[edge]
+
+    def result(self, board):
+        """Returns (value, distance) for the side to move, or None for an illegal board."""
+        index = self.index(board)
+        if index == NOT_LEGAL:
+            return None
+        return self.values[index], self.distances[index]
+
+    def best_moves(self, board):
+        """Returns every move (row, col) that keeps the best result at the best distance."""
+        index = self.index(board)
+        if index == NOT_LEGAL:
+            return []
+        value = self.values[index]
+        distance = self.distances[index]
+        return [divmod(cell, 3) for cell, child in self.moves(index)
+                if self.values[child] == -value and self.distances[child] == distance - 1]
+
+
+def _enumerate():
+    """Returns the sorted codes of every legal position and {code: [(cell, child code)]}."""
+    edges = {}
+    pending = [0]
+    while pending:
+        code = pending.pop()
+        if code in edges:
+            continue
+        board = _decode(code)
+        moves = []
+        if not (check_winner(board, "X") or check_winner(board, "O") or is_full(board)):
+            mark = MARKS[side_to_move(board)]
+            for cell in range(9):
+                if board[cell // 3][cell % 3] == " ":
+                    child = code + mark * 3 ** (8 - cell)
+                    moves.append((cell, child))
+                    pending.append(child)
+        edges[code] = moves
+    return sorted(edges), edges
+
+
+def build_graph():
+    """Enumerates every legal position, builds the successor graph and solves it backwards."""
+    codes, edges = _enumerate()
+    rank = {code: index for index, code in enumerate(codes)}
+    count = len(codes)
+
+    offsets = array("H", [0])
+    successors = array("H")
+    cells = array("B")
+    parents = [[] for _ in range(count)]
+    for index, code in enumerate(codes):
+        for cell, child in edges[code]:
+            successors.append(rank[child])
+            cells.append(cell)
+            parents[rank[child]].append(index)
+        offsets.append(len(successors))
+
+    values = array("b", [DRAW]) * count
+    distances = array("B", [0]) * count
+    solved = bytearray(count)
+    unsolved_moves = [offsets[i + 1] - offsets[i] for i in range(count)]
+
+    # Terminal positions: the side to move has lost if the previous move won
+    queue = deque()
+    for index, code in enumerate(codes):
+        if unsolved_moves[index] == 0:
+            board = _decode(code)
+            mover = side_to_move(board)
+            if check_winner(board, "O" if mover == "X" else "X"):
+                values[index] = LOSS
+                solved[index] = 1
+                queue.append(index)
+
+    # Backward induction, in order of distance
+    while queue:
+        child = queue.popleft()
+        for parent in parents[child]:
+            if solved[parent]:
+                continue
+            if values[child] == LOSS:
+                values[parent] = WIN
+            else:
+                unsolved_moves[parent] -= 1
+                if unsolved_moves[parent]:
+                    continue
+                values[parent] = LOSS  # Every move loses; the last one found stalls longest
+            distances[parent] = distances[child] + 1
+            solved[parent] = 1
+            queue.append(parent)
+
+    # Everything else is a draw, which always fills the board
+    for index, code in enumerate(codes):
+        if not solved[index]:
+            distances[index] = sum(1 for row in _decode(code) for cell in row if cell == " ")
+    return GameGraph(array("H", codes), offsets, successors, cells, values, distances)
+
+
+def save_graph(graph, path=GRAPH_FILE):
+    """Writes the graph arrays: MAGIC, position count, edge count, then each array."""
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        array("I", [len(graph), len(graph.successors)]).tofile(f)
+        for data in (graph.codes, graph.offsets, graph.successors, graph.cells, graph.values, graph.distances):
+            data.tofile(f)
+
+
+def load_graph(path=GRAPH_FILE):
+    """Reads a graph written by save_graph, or returns None if it's missing or invalid."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            sizes = array("I")
+            sizes.fromfile(f, 2)
+            count, edges = sizes
+            arrays = []
+            for typecode, length in (("H", count), ("H", count + 1), ("H", edges), ("B", edges), ("b", count),
+                                     ("B", count)):
+                data = array(typecode)
+                data.fromfile(f, length)
+                arrays.append(data)
+    except (OSError, EOFError):
+        return None
+    return GameGraph(*arrays)
+
+
+_default_graph = None
+
+
+def default_graph():
+    """Returns the solved graph from GRAPH_FILE (built instead if it's missing), once per process."""
+    global _default_graph
+    if _default_graph is None:
+        _default_graph = load_graph()
+        if _default_graph is None:
+            _default_graph = build_graph()
+    return _default_graph
+
+
+def cross_check(graph, table=None):
+    """Compares every non-terminal value against the perfect-play table; returns the positions checked."""
+    table = default_table() if table is None else table
+    checked = 0
+    for index in range(len(graph)):
+        if graph.offsets[index] == graph.offsets[index + 1]:
+            continue  # Terminal: the table has no entry
+        side = SIDES.index(side_to_move(graph.board(index)))
+        score = table[side * POSITIONS + graph.codes[index]] % 3 - 1
+        if score != graph.values[index]:
+            raise AssertionError(f"Position {graph.board(index)}: graph {graph.values[index]}, table {score}")
+        checked += 1
+    return checked
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Solve the game graph by retrograde analysis.")
+    parser.add_argument("--output", default=GRAPH_FILE, help="where to write the graph")
+    parser.add_argument("--check", action="store_true", help="cross-check every value against the perfect-play table")
+    args = parser.parse_args(argv)
+
+    graph = build_graph()
+    save_graph(graph, args.output)
+    counts = {name: sum(1 for value in graph.values if value == result)
+              for name, result in (("won", WIN), ("drawn", DRAW), ("lost", LOSS))}
+    print(f"Solved {len(graph)} positions and {len(graph.successors)} moves "
+          f"({counts['won']} won, {counts['drawn']} drawn, {counts['lost']} lost for the side to move), "
+          f"wrote {args.output}")
+    if args.check:
+        print(f"Cross-checked {cross_check(graph)} positions against the perfect-play table")
@@ -0,0 +1,556 @@
+from array import array
+from collections import OrderedDict
+
+from .bitboard import CELLS, FULL_MASK, WINNING, Bitboard, iter_bits
+from .board import check_winner, get_available_moves, is_full
+from .state import LINES, GameState
+
+# Move-selection searches for 3x3 Tic-Tac-Toe.
+#
+# minimax/find_best_move are the original plain search, kept as the reference
+# the faster searches are checked against. CachedSearch is plain Minimax with a
+# transposition table. Positions are cached under a canonical key: the smallest
+# encoding among the 8 rotations and reflections of the board, so symmetric
+# positions share an entry no matter which move order reached them.
+#
+# AlphaBetaSearch prunes with alpha-beta, tries center -> corners -> sides
+# first and scores quicker wins (and slower losses) higher.
+#
+# FlatSearch is the allocation-free variant: the position lives in one 9-cell
+# bytearray, moves are made and unmade in place, wins are checked only on the
+# lines through the last move, and the recursion is an explicit loop over
+# preallocated per-ply arrays. Every value the loop computes stays within
+# CPython's cached small ints (-5 to 256), so it creates no objects per node;
+# the node count is folded into an array slot every SMALL_INT_LIMIT nodes.
+#
+# StateSearch runs the same alpha-beta Minimax on a GameState, making and
+# unmaking every move with play/undo: the state's line counts answer "did it
+# win?" and its free-cell mask "what's left?" without rescanning the board.
+
+DEFAULT_TABLE_SIZE = 4096
+
+# Center, corners, then sides (same priorities as make_mistake and hard.py)
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# A win on ply `depth` scores WIN_SCORE - depth
+WIN_SCORE = 10
+
+
+def minimax(board, depth, is_maximizing, computer, player):
+    """Minimax algorithm for making the AI unbeatable."""
+    if check_winner(board, computer):
+        return 1  # AI wins
+    if check_winner(board, player):
+        return -1  # Player wins
+    if is_full(board):
+        return 0  # It's a draw
+
+    available_moves = get_available_moves(board)
+
+    if is_maximizing:
+        best_score = -float("inf")  # AI wants the highest score
+        for row, col in available_moves:
+            board[row][col] = computer
+            score = minimax(board, depth + 1, False, computer, player)
+            board[row][col] = " "  # Undo move
+            best_score = max(best_score, score)
+        return best_score
+    else:
+        best_score = float("inf")  # Player wants the lowest score
+        for row, col in available_moves:
+            board[row][col] = player
+            score = minimax(board, depth + 1, True, computer, player)
+            board[row][col] = " "  # Undo move
+            best_score = min(best_score, score)
+        return best_score
+
+
+def find_best_move(board, computer, player):
+    """Finds the best move for the computer using plain Minimax."""
+    best_score = -float("inf")
+    best_move = None
+
+    for row, col in get_available_moves(board):
+        board[row][col] = computer
+        score = minimax(board, 0, False, computer, player)  # Run Minimax
+        board[row][col] = " "  # Undo move
+
+        if score > best_score:
+            best_score = score
+            best_move = (row, col)
+
+    return best_move
+
+
+def _symmetries():
+    """Returns the 8 rotations/reflections as cell-index permutations."""
+    def rotate(r, c):
+        return c, 2 - r
+
+    def reflect(r, c):
+        return r, 2 - c
+
+    perms = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = []
+            for cell in range(9):
+                r, c = CELLS[cell]
+                if flip:
+                    r, c = reflect(r, c)
+                for _ in range(turns):
+                    r, c = rotate(r, c)
+                perm.append(r * 3 + c)
+            perms.append(tuple(perm))
+    return tuple(perms)
+
+
+SYMMETRIES = _symmetries()
+
+
+def _permute_table(perm):
+    """Maps every 9-bit mask to the mask with its cells moved by `perm`."""
+    table = [0] * (FULL_MASK + 1)
+    for mask in range(1, FULL_MASK + 1):
+        low = mask & -mask  # Reuse the entry for the mask without its lowest cell
+        table[mask] = table[mask ^ low] | 1 << perm[low.bit_length() - 1]
+    return tuple(table)
+
+
+# PERMUTE[s][mask] is `mask` with its cells moved by symmetry s
+PERMUTE = tuple(_permute_table(perm) for perm in SYMMETRIES)
+
+
+def canonical(mine, theirs):
+    """Returns the symmetry-independent key for a position (side to move holds `mine`)."""
+    return min(perm[mine] | perm[theirs] << 9 for perm in PERMUTE)
+
+
+class TranspositionTable:
+    """A bounded least-recently-used cache of position values."""
+
+    def __init__(self, max_size=DEFAULT_TABLE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached value for a key, or None."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entry if full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class CachedSearch:
+    """Minimax with a symmetry-aware transposition table.
+
+    Picks exactly the same moves as the plain `find_best_move`: the first move
+    (row-major) with the highest Minimax score.
+    """
+
+    def __init__(self, max_size=DEFAULT_TABLE_SIZE):
+        self.table = TranspositionTable(max_size)
+        self.nodes = 0
+
+    def _value(self, mine, theirs):
+        """Minimax value for the side to move: 1 win, 0 draw, -1 loss."""
+        self.nodes += 1
+        if WINNING[theirs]:
+            return -1  # The previous move won
+        empty = FULL_MASK ^ (mine | theirs)
+        if not empty:
+            return 0  # It's a draw
+
+        key = canonical(mine, theirs)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        value = -1
+        for cell in iter_bits(empty):
+            score = -self._value(theirs, mine | 1 << cell)
+            if score > value:
+                value = score
+        self.table.put(key, value)
+        return value
+
+    def score_moves(self, board, computer, player):
+        """Returns [((row, col), score)] for every available move, scored for the computer."""
+        position = Bitboard.from_board(board)
+        mine = position.mask(computer)
+        theirs = position.mask(player)
+        return [(CELLS[cell], self._root_score(cell, mine, theirs)) for cell in iter_bits(position.empty_mask())]
+
+    def _root_score(self, cell, mine, theirs):
+        """Score of the side holding `mine` playing `cell` (one root move)."""
+        return -self._value(theirs, mine | 1 << cell)
+
+    def find_best_move(self, board, computer, player):
+        """Finds the best move for the computer (None if the board is full)."""
+        best_score = -float("inf")
+        best_move = None
+        for move, score in self.score_moves(board, computer, player):
+            if score > best_score:
+                best_score = score
+                best_move = move
+        return best_move
+
+    def stats(self):
+        """Returns node and cache counters."""
+        return {
+            "nodes": self.nodes,
+            "hits": self.table.hits,
+            "misses": self.table.misses,
+            "entries": len(self.table),
+        }
+
+    def reset_stats(self):
+        """Zeroes the counters without dropping cached positions."""
+        self.nodes = 0
+        self.table.hits = 0
+        self.table.misses = 0
+
+
+class AlphaBetaSearch:
+    """Depth-aware Minimax with alpha-beta pruning and center/corner/side move ordering.
+
+    With pruning=False it visits every node, which gives the baseline node
+    count to measure the pruning gain against.
+    """
+
+    def __init__(self, pruning=True):
+        self.pruning = pruning
+        self.nodes = 0
+
+    def _negamax(self, mine, theirs, depth, alpha, beta):
+        """Depth-adjusted score for the side to move, clamped to [alpha, beta]."""
+        self.nodes += 1
+        if WINNING[theirs]:
+            return depth - WIN_SCORE  # The previous move won; later losses score higher
+        empty = FULL_MASK ^ (mine | theirs)
+        if not empty:
+            return 0  # It's a draw
+
+        for cell in MOVE_ORDER:
+            if empty & 1 << cell:
+                score = -self._negamax(theirs, mine | 1 << cell, depth + 1, -beta, -alpha)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta and self.pruning:
+                        break
+        return alpha
+
+    def _ordered_moves(self, board, computer, player):
+        position = Bitboard.from_board(board)
+        empty = position.empty_mask()
+        mine = position.mask(computer)
+        theirs = position.mask(player)
+        return [cell for cell in MOVE_ORDER if empty & 1 << cell], mine, theirs
+
+    def score_moves(self, board, computer, player):
+        """Returns [((row, col), score)] for every available move in search order.
+
+        Each move gets a full window, so the scores are exact (positive = win,
+        higher = sooner).
+        """
+        cells, mine, theirs = self._ordered_moves(board, computer, player)
+        bound = WIN_SCORE + 1
+        return [(CELLS[cell], self._root_score(cell, mine, theirs, -bound, bound)) for cell in cells]
+
+    def _root_score(self, cell, mine, theirs, alpha, beta):
+        """Score of the side holding `mine` playing `cell` (one root move), clamped to [alpha, beta]."""
+        return -self._negamax(theirs, mine | 1 << cell, 1, -beta, -alpha)
+
+    def find_best_move(self, board, computer, player):
+        """Finds the best move for the computer (None if the board is full)."""
+        cells, mine, theirs = self._ordered_moves(board, computer, player)
+        bound = WIN_SCORE + 1
+        best_score = -bound
+        best_move = None
+        for cell in cells:
+            score = self._root_score(cell, mine, theirs, best_score, bound)
+            if score > best_score:
+                best_score = score
+                best_move = CELLS[cell]
+        return best_move
+
+    def stats(self):
+        """Returns the node counter."""
+        return {"nodes": self.nodes}
+
+    def reset_stats(self):
+        self.nodes = 0
+
+
+# PARTNERS[cell] lists the other two cells of every line through `cell`, flattened
+PARTNERS = tuple(tuple(other for line in LINES if cell in line for other in line if other != cell)
+                 for cell in range(9))
+
+EMPTY, FIRST, SECOND = 0, 1, 2  # FlatSearch cell values; 3 - mark is the other side
+SMALL_INT_LIMIT = 256  # Largest int CPython keeps cached
+
+
+class FlatSearch:
+    """Minimax with alpha-beta on a flat bytearray board, without per-node allocations.
+
+    Scores are the plain Minimax ones (1 win, 0 draw, -1 loss) and the chosen
+    move is the same as `find_best_move`: the first move (row-major) with the
+    highest score. Pruning only skips moves that can't change that choice.
+    """
+
+    def __init__(self):
+        self.cells = bytearray(9)
+        # Per-ply state of the search loop: next cell to try, move made, window
+        self.next_cell = array("b", [0]) * 10
+        self.moved = array("b", [0]) * 10
+        self.alphas = array("b", [0]) * 10
+        self.betas = array("b", [0]) * 10
+        self.node_count = array("q", [0])
+
+    @property
+    def nodes(self):
+        """Moves made since the last reset_stats (kept in an array slot, so no int object is retained)."""
+        return self.node_count[0]
+
+    def _load(self, board, computer):
+        """Copies a nested-list board into self.cells (computer = FIRST); returns the filled count."""
+        cells = self.cells
+        filled = 0
+        for row in range(3):
+            for col in range(3):
+                mark = board[row][col]
+                cells[row * 3 + col] = EMPTY if mark == " " else FIRST if mark == computer else SECOND
+                filled += mark != " "
+        return filled
+
+    def _wins(self, cell, mark):
+        """True if `mark` on `cell` completes a line."""
+        cells = self.cells
+        partners = PARTNERS[cell]
+        index = 0
+        while index < len(partners):
+            if cells[partners[index]] == mark and cells[partners[index + 1]] == mark:
+                return True
+            index += 2
+        return False
+
+    def _negamax(self, mark, filled, alpha, beta):
+        """Fail-hard value of self.cells for `mark` to move, within [alpha, beta]."""
+        cells = self.cells
+        next_cell = self.next_cell
+        moved = self.moved
+        alphas = self.alphas
+        betas = self.betas
+        nodes = 0
+        ply = 0
+        next_cell[0] = 0
+        alphas[0] = alpha
+        betas[0] = beta
+        while True:
+            cell = next_cell[ply]
+            while cell < 9 and cells[cell]:
+                cell += 1
+            if cell < 9 and alphas[ply] < betas[ply]:
+                # Make the next move
+                next_cell[ply] = cell + 1
+                cells[cell] = mark
+                filled += 1
+                nodes += 1
+                if nodes == SMALL_INT_LIMIT:
+                    self.node_count[0] += nodes
+                    nodes = 0
+                if self._wins(cell, mark):
+                    score = 1
+                elif filled == 9:
+                    score = 0
+                else:
+                    moved[ply] = cell
+                    ply += 1
+                    next_cell[ply] = 0
+                    alphas[ply] = -betas[ply - 1]
+                    betas[ply] = -alphas[ply - 1]
+                    mark = 3 - mark
+                    continue
+                cells[cell] = EMPTY
+                filled -= 1
+                if score > alphas[ply]:
+                    alphas[ply] = score
+                continue
+
+            # Every move tried (or cut off): return to the parent
+            if ply == 0:
+                self.node_count[0] += nodes
+                return alphas[0]
+            score = -alphas[ply]
+            ply -= 1
+            mark = 3 - mark
+            cells[moved[ply]] = EMPTY
+            filled -= 1
+            if score > alphas[ply]:
+                alphas[ply] = score
+
+    def _score(self, cell, filled, floor=-2):
+        """Score of the computer playing `cell`; exact if above `floor`, else at most `floor`."""
+        cells = self.cells
+        cells[cell] = FIRST
+        self.node_count[0] += 1
+        if self._wins(cell, FIRST):
+            score = 1
+        elif filled + 1 == 9:
+            score = 0
+        else:
+            score = -self._negamax(SECOND, filled + 1, -1, -floor)
+        cells[cell] = EMPTY
+        return score
+
+    def score_moves(self, board, computer, player):
+        """Returns [((row, col), score)] for every available move, scored for the computer."""
+        filled = self._load(board, computer)
+        return [(CELLS[cell], self._score(cell, filled)) for cell in range(9) if not self.cells[cell]]
+
+    def find_best_move(self, board, computer, player):
+        """Finds the best move for the computer (None if the board is full)."""
+        filled = self._load(board, computer)
+        best_score = -2
+        best_move = None
+        for cell in range(9):
+            if not self.cells[cell]:
+                score = self._score(cell, filled, best_score)  # Later moves only matter if they score higher
+                if score > best_score:
+                    best_score = score
+                    best_move = CELLS[cell]
+                    if score == 1:
+                        break  # Nothing beats a win
+        return best_move
+
+    def stats(self):
+        """Returns the node counter."""
+        return {"nodes": self.nodes}
+
+    def reset_stats(self):
+        self.node_count[0] = 0
+
+
+class StateSearch:
+    """Minimax with alpha-beta on a GameState, moves made with play and taken back with undo.
+
+    Scores and moves match `find_best_move` (1 win, 0 draw, -1 loss; the first
+    row-major move with the highest score), like FlatSearch.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+
+    def _value(self, state, mover, other, alpha, beta):
+        """Fail-hard value of a game in progress for `mover` to move, within [alpha, beta]."""
+        for cell in iter_bits(state.free):
+            score = self._move_score(state, cell, mover, other, alpha, beta)
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def _move_score(self, state, cell, mover, other, alpha=-1, beta=1):
+        """Score of `mover` playing `cell`, made and unmade on the state."""
+        self.nodes += 1
+        row, col = CELLS[cell]
+        if state.play(row, col, mover):
+            score = 1
+        elif state.is_full():
+            score = 0
+        else:
+            score = -self._value(state, other, mover, -beta, -alpha)
+        state.undo()
+        return score
+
+    def _root_score(self, state, cell, computer, player, floor=-2):
+        """Score of the computer playing `cell`; exact if above `floor`, else at most `floor`."""
+        return self._move_score(state, cell, computer, player, floor, 1)
+
+    def score_moves(self, board, computer, player):
+        """Returns [((row, col), score)] for every available move, scored for the computer."""
+        state = GameState.from_board(board)
+        return [(CELLS[cell], self._root_score(state, cell, computer, player)) for cell in iter_bits(state.free)]
+
+    def find_best_move(self, board, computer, player):
+        """Finds the best move for the computer (None if the board is full)."""
+        state = GameState.from_board(board)
+        best_score = -2
+        best_move = None
+        for cell in iter_bits(state.free):
+            score = self._root_score(state, cell, computer, player, best_score)
+            if score > best_score:
+                best_score = score
+                best_move = CELLS[cell]
+                if score == 1:
+                    break  # Nothing beats a win
+        return best_move
+
+    def stats(self):
+        """Returns the node counter."""
+        return {"nodes": self.nodes}
+
+    def reset_stats(self):
+        self.nodes = 0
+
+
+SEARCH_MODES = {
+    "minimax": CachedSearch,
+    "alphabeta": AlphaBetaSearch,
+    "flat": FlatSearch,
+    "state": StateSearch,
+}
+
+
+def make_search(mode="minimax", **options):
+    """Creates a search by mode name: "minimax" (cached, same moves as before), "alphabeta", "flat" or "state"."""
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode!r}; choose from {', '.join(SEARCH_MODES)}")
+    return SEARCH_MODES[mode](**options)
+
+
+_default_search = None
+
+
+def default_search():
+    """Returns the process-wide CachedSearch, so every strategy shares one cache."""
+    global _default_search
+    if _default_search is None:
+        _default_search = CachedSearch()
+    return _default_search
+
+
+def compare_node_counts():
+    """Prints each search's move and node count on the empty board."""
+    empty_board = [[" " for _ in range(3)] for _ in range(3)]
+    for name, search in (
+        ("minimax (cached)", CachedSearch()),
+        ("depth-aware minimax", AlphaBetaSearch(pruning=False)),
+        ("alpha-beta", AlphaBetaSearch()),
+        ("flat alpha-beta", FlatSearch()),
+        ("state alpha-beta", StateSearch()),
+    ):
+        move = search.find_best_move(empty_board, "O", "X")
+        print(f"{name:20} move {move}  nodes {search.nodes}")
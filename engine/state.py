@@ -0,0 +1,92 @@
+from .bitboard import CELLS, FULL_MASK, POPCOUNT, WIN_MASKS, iter_bits
+from .board import new_board
+
+# Incremental game state for 3x3 Tic-Tac-Toe.
+#
+# Alongside the nested-list board the strategies read, the state keeps each
+# player's mark count on the 8 winning lines and a 9-bit mask of the free
+# cells (bit row * 3 + col, so iter_bits walks it row-major), all updated by
+# play/undo. "Did this move win?", "is it full?" and "which moves are left?"
+# never rescan the board.
+
+LINES = tuple(tuple(iter_bits(mask)) for mask in WIN_MASKS)
+
+# Indices of the lines through each cell
+CELL_LINES = tuple(tuple(index for index, line in enumerate(LINES) if cell in line) for cell in range(9))
+
+
+class GameState:
+    """A board plus per-line counts, the free-cell mask and the winner, updated move by move."""
+
+    __slots__ = ("board", "counts", "free", "winner", "history")
+
+    def __init__(self):
+        self.board = new_board()
+        self.counts = {"X": [0] * len(LINES), "O": [0] * len(LINES)}
+        self.free = FULL_MASK
+        self.winner = None
+        self.history = []
+
+    @classmethod
+    def from_board(cls, board):
+        """Builds a state from a nested-list board (row-major move order)."""
+        state = cls()
+        for row in range(3):
+            for col in range(3):
+                if board[row][col] != " ":
+                    state.play(row, col, board[row][col])
+        return state
+
+    def play(self, row, col, player):
+        """Places a mark and returns True if it completed a line."""
+        cell = row * 3 + col
+        if not self.free & 1 << cell:
+            raise ValueError(f"Cell {cell + 1} is already taken")
+        self.free ^= 1 << cell
+        self.board[row][col] = player
+        self.history.append(cell)
+        counts = self.counts[player]
+        won = False
+        for line in CELL_LINES[cell]:
+            counts[line] += 1
+            if counts[line] == 3:
+                won = True
+        if won:
+            self.winner = player
+        return won
+
+    def reset(self):
+        """Clears the game in place, so `board` (and anything holding it) stays valid."""
+        for row in self.board:
+            row[:] = [" "] * 3
+        for counts in self.counts.values():
+            counts[:] = [0] * len(LINES)
+        self.free = FULL_MASK
+        self.winner = None
+        self.history.clear()
+
+    def undo(self):
+        """Takes back the last move."""
+        cell = self.history.pop()
+        row, col = CELLS[cell]
+        counts = self.counts[self.board[row][col]]
+        for line in CELL_LINES[cell]:
+            counts[line] -= 1
+        self.board[row][col] = " "
+        self.free |= 1 << cell
+        self.winner = None  # Play stops at the first win, so only the last move can have won
+
+    def check_winner(self, player):
+        return self.winner == player
+
+    def is_full(self):
+        return not self.free
+
+    @property
+    def empty(self):
+        """Number of free cells."""
+        return POPCOUNT[self.free]
+
+    def get_available_moves(self):
+        """Returns the free cells as (row, col), row-major like get_available_moves."""
+        return [CELLS[cell] for cell in iter_bits(self.free)]
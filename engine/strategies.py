@@ -0,0 +1,223 @@
+import random
+
+from .bitboard import CELLS, THREATS, Bitboard, iter_bits
+from .board import check_winner, get_available_moves
+from .perfect_table import default_table, lookup
+from .search import default_search
+from .tablebase import DRAW, WIN, default_tablebase
+
+# Pluggable AI strategies shared by the console scripts, the GUI and the tools.
+#
+# A strategy picks a move for `computer` on a nested-list board and returns
+# (row, col). Build one once and reuse it: searches and tables are shared per
+# process. After each move, `last_path` ("optimal" or "mistake") and
+# `last_source` (where the move came from) say how it was chosen, for
+# engine/instrument.py.
+#
+# Randomised strategies draw from `rng`, the global `random` module unless a
+# random.Random (or a seed) is passed in. simulate.py gives every game its own
+# seeded generator, so any game of a large parallel run replays on its own.
+
+CENTER = (1, 1)
+CORNERS = [(0, 0), (0, 2), (2, 0), (2, 2)]
+CENTER_BIT = 1 << 4
+CORNER_CELLS = (0, 2, 6, 8)  # Same order as CORNERS
+
+
+def make_mistake(board, computer, player, rng=random):
+    """Makes a strategic but non-perfect move, picking at random from `rng`."""
+    available_moves = get_available_moves(board)
+
+    # Try to block if the player is about to win
+    for row, col in available_moves:
+        board[row][col] = player
+        if check_winner(board, player):
+            board[row][col] = " "
+            return row, col  # Block player's win
+        board[row][col] = " "
+
+    # Otherwise, pick center, corner, or a random move
+    if CENTER in available_moves:
+        return CENTER
+
+    corner_moves = [move for move in CORNERS if move in available_moves]
+    if corner_moves:
+        return rng.choice(corner_moves)
+
+    return rng.choice(available_moves)  # Last resort
+
+
+def make_rng(rng=None):
+    """Returns the random source for `rng`: the global module for None, a new generator for a seed."""
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
+
+
+class Strategy:
+    """Base class: picks a move for the computer."""
+
+    name = None
+    last_path = None
+    last_source = None
+    rng = random  # Replace with a random.Random to make the strategy's choices reproducible
+
+    def choose_move(self, board, computer, player):
+        """Returns (row, col) for the computer to play."""
+        raise NotImplementedError
+
+    def __call__(self, board, computer, player):
+        return self.choose_move(board, computer, player)
+
+
+class RandomStrategy(Strategy):
+    """Plays any free cell (easy.py)."""
+
+    name = "random"
+
+    def __init__(self, rng=None):
+        self.rng = make_rng(rng)
+
+    def choose_move(self, board, computer, player):
+        return self.rng.choice(get_available_moves(board))
+
+
+class RuleBasedStrategy(Strategy):
+    """Win, block, center, corner, side (hard.py)."""
+
+    name = "rule-based"
+
+    def __init__(self, rng=None):
+        self.rng = make_rng(rng)
+
+    def choose_move(self, board, computer, player):
+        position = Bitboard.from_board(board)
+        empty = position.empty_mask()
+
+        # 1️⃣ Check if the computer can win, 2️⃣ then if the player must be blocked
+        for mark in (computer, player):
+            threats = THREATS[position.mask(mark)] & empty
+            if threats:
+                return CELLS[(threats & -threats).bit_length() - 1]  # First in row-major order
+
+        # 3️⃣ Take the center if available
+        if empty & CENTER_BIT:
+            return CENTER
+
+        # 4️⃣ Take a corner if available
+        corner_moves = [CELLS[cell] for cell in CORNER_CELLS if empty >> cell & 1]
+        if corner_moves:
+            return self.rng.choice(corner_moves)
+
+        # 5️⃣ Take a side space if nothing else
+        return self.rng.choice([CELLS[cell] for cell in iter_bits(empty)])
+
+
+class MistakeStrategy(Strategy):
+    """Plays the best move, except for a `mistake_chance` share of turns (choose-level).
+
+    Both branches come from the tablebase when it covers the position, and
+    play exactly as make_mistake and the search would. Pass tablebase=False
+    to always search.
+    """
+
+    name = "mistake"
+
+    def __init__(self, mistake_chance, search=None, tablebase=None, rng=None):
+        self.mistake_chance = mistake_chance
+        self.search = search or default_search()
+        self.tablebase = default_tablebase() if tablebase is None else tablebase or None
+        self.rng = make_rng(rng)
+
+    def choose_move(self, board, computer, player):
+        entry = self.tablebase.entry(board, computer) if self.tablebase is not None else None
+        self.last_source = "tablebase" if entry is not None else "search"
+        if self.rng.random() < self.mistake_chance:  # Random chance to make a mistake
+            self.last_path = "mistake"
+            if entry is None:
+                self.last_source = "rules"
+                return make_mistake(board, computer, player, self.rng)
+            return entry.block or self.rng.choice(entry.choices)
+        self.last_path = "optimal"
+        if entry is None:
+            return self.search.find_best_move(board, computer, player)  # Play optimally
+        return entry.best
+
+
+class GradedStrategy(Strategy):
+    """Plays the best move, except for a `mistake_chance` share of turns that drop one blunder class.
+
+    A mistake swaps a winning move for a drawing one or a drawing move for a
+    losing one, picked at random, and never gives away more; when there is no
+    such move it plays the best one.
+    """
+
+    name = "graded"
+
+    def __init__(self, mistake_chance, search=None, tablebase=None, rng=None):
+        self.mistake_chance = mistake_chance
+        self.search = search or default_search()
+        self.tablebase = default_tablebase() if tablebase is None else tablebase or None
+        self.rng = make_rng(rng)
+
+    def choose_move(self, board, computer, player):
+        entry = self.tablebase.entry(board, computer) if self.tablebase is not None else None
+        self.last_path = "optimal"
+        if entry is None:
+            self.last_source = "search"
+            return self.search.find_best_move(board, computer, player)
+        self.last_source = "tablebase"
+        if self.rng.random() < self.mistake_chance:
+            worse = {WIN: entry.draws, DRAW: entry.loses}.get(entry.value)
+            if worse:
+                self.last_path = "mistake"
+                return self.rng.choice(worse)
+        return entry.best
+
+
+class PerfectStrategy(Strategy):
+    """Always plays the Minimax move, from the perfect-play table when possible (unbeatable.py).
+
+    Pass table=False to always search.
+    """
+
+    name = "perfect"
+    last_path = "optimal"
+
+    def __init__(self, table=None, search=None):
+        self.table = default_table() if table is None else table or None
+        self.search = search or default_search()
+
+    def choose_move(self, board, computer, player):
+        if self.table is not None:
+            entry = lookup(self.table, board, computer)
+            if entry is not None:
+                self.last_source = "table"
+                return entry[0]
+        self.last_source = "search"
+        return self.search.find_best_move(board, computer, player)
+
+
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    RuleBasedStrategy.name: RuleBasedStrategy,
+    MistakeStrategy.name: MistakeStrategy,
+    GradedStrategy.name: GradedStrategy,
+    PerfectStrategy.name: PerfectStrategy,
+}
+
+
+def make_strategy(name, **options):
+    """Creates a strategy by name.
+
+    "random", "rule-based", "mistake" / "graded" (need mistake_chance),
+    "perfect" or "mcts" (see engine/mcts.py). Every randomised strategy
+    takes rng= (a random.Random or a seed).
+    """
+    if name not in STRATEGIES:
+        from . import mcts  # noqa: F401 (registers "mcts"; loaded only when needed, to keep start-up light)
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name!r}; choose from {', '.join(STRATEGIES)}")
+    return STRATEGIES[name](**options)
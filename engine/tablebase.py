@@ -0,0 +1,135 @@
+import os
+import pickle
+import zlib
+from collections import namedtuple
+
+from .bitboard import CELLS, FULL_MASK, WINNING, iter_bits
+from .perfect_table import NO_MOVE, POSITIONS, SIDES, default_table, encode
+
+# Per-move tablebase: every legal move of every reachable position, graded.
+#
+# Built in memory from the perfect-play table (a move's value is the negated
+# table score of the position it leads to), so it covers openings and
+# endgames alike and never disagrees with it. Each entry groups the moves by
+# blunder class, all in row-major order:
+#   wins   - moves that keep a forced win
+#   draws  - moves that give up at most a draw
+#   loses  - moves after which the opponent can force a win
+# plus `best` (the find_best_move choice) and the move make_mistake would play
+# (`block`, or a random pick from `choices`), so every strategy branch is one
+# lookup.
+#
+# Building takes a noticeable fraction of a second, so `python -m engine table`
+# also pickles the entries to TABLEBASE_FILE, tagged with a checksum of the
+# table they came from; startup loads that instead when it matches.
+
+TABLEBASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.pickle")
+
+WIN, DRAW, LOSS = 1, 0, -1
+CENTER_BIT = 1 << 4
+CORNER_BITS = (0, 2, 6, 8)  # Same order as strategies.CORNERS
+
+Entry = namedtuple("Entry", "best value wins draws loses block choices")
+
+
+def _decode(code):
+    """Returns the (X mask, O mask) of a base-3 position number."""
+    x = o = 0
+    for cell in range(8, -1, -1):
+        code, mark = divmod(code, 3)
+        if mark == 1:
+            x |= 1 << cell
+        elif mark == 2:
+            o |= 1 << cell
+    return x, o
+
+
+def _entry(table, side, code):
+    mine, theirs = _decode(code)
+    if side == 1:
+        mine, theirs = theirs, mine
+    other = 1 - side
+    empty = FULL_MASK & ~(mine | theirs)
+
+    classes = {WIN: [], DRAW: [], LOSS: []}
+    for cell in iter_bits(empty):
+        bit = 1 << cell
+        if WINNING[mine | bit]:
+            value = WIN
+        elif empty == bit:
+            value = DRAW  # Last cell
+        else:
+            child = code + (side + 1) * 3 ** (8 - cell)
+            value = 1 - table[other * POSITIONS + child] % 3  # Negated opponent score
+        classes[value].append(CELLS[cell])
+
+    move, score = divmod(table[side * POSITIONS + code], 3)
+
+    # make_mistake: block the first threat, else center, else a random corner, else any cell
+    block = next((CELLS[cell] for cell in iter_bits(empty) if WINNING[theirs | 1 << cell]), None)
+    if block is None and empty & CENTER_BIT:
+        block = CELLS[4]
+    corners = tuple(CELLS[cell] for cell in CORNER_BITS if empty >> cell & 1)
+    choices = corners or tuple(CELLS[cell] for cell in iter_bits(empty))
+
+    return Entry(CELLS[move], score - 1, tuple(classes[WIN]), tuple(classes[DRAW]), tuple(classes[LOSS]),
+                 block, choices)
+
+
+class Tablebase:
+    """Graded moves for every (side to move, position) the perfect-play table covers."""
+
+    def __init__(self, table=None, entries=None):
+        if entries is None:
+            entries = [None] * (len(SIDES) * POSITIONS)
+            for index, stored in enumerate(table):
+                if stored != NO_MOVE:
+                    entries[index] = _entry(table, *divmod(index, POSITIONS))
+        self.entries = entries
+
+    def entry(self, board, computer):
+        """Returns the Entry for `computer` to move, or None if the position isn't covered."""
+        if computer not in SIDES:
+            return None
+        return self.entries[SIDES.index(computer) * POSITIONS + encode(board)]
+
+    def __len__(self):
+        return sum(1 for entry in self.entries if entry is not None)
+
+
+def save_tablebase(tablebase, table, path=TABLEBASE_FILE):
+    """Pickles a tablebase along with the checksum of the table it was built from."""
+    with open(path, "wb") as f:
+        pickle.dump((zlib.crc32(table), tablebase.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_tablebase(table, path=TABLEBASE_FILE):
+    """Loads a pickled tablebase, or returns None if it's missing or was built from another table."""
+    try:
+        with open(path, "rb") as f:
+            checksum, entries = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+    if checksum != zlib.crc32(table) or len(entries) != len(SIDES) * POSITIONS:
+        return None
+    return Tablebase(entries=entries)
+
+
+_default_tablebase = False  # Not loaded yet
+
+
+def default_tablebase():
+    """Returns the tablebase for the default perfect-play table, once per process (None if missing).
+
+    Loads TABLEBASE_FILE when it matches the table and builds it otherwise.
+    """
+    global _default_tablebase
+    if _default_tablebase is False:
+        table = default_table()
+        if table is None:
+            _default_tablebase = None
+        else:
+            _default_tablebase = load_tablebase(table)
+            if _default_tablebase is None:
+                _default_tablebase = Tablebase(table)
+    return _default_tablebase
@@ -0,0 +1,196 @@
+import argparse
+import time
+
+from engine import default_search
+from engine.lineboard import LineBoard
+from engine.mcts import MCTSStrategy
+
+# N x N, K-in-a-row engine (4x4, 5x5 with 4 in a row, 15x15 gomoku, ...).
+#
+# The board (engine/lineboard.py) keeps a per-line count of each player's
+# marks for every window of K cells, updated on each move, so wins and the
+# heuristic score never need a rescan. Search is alpha-beta under iterative
+# deepening with a per-move time budget. Plain 3x3 games go to the exact
+# cached Minimax, so they play exactly as find_best_move does.
+
+DEFAULT_BUDGET_MS = 1000
+WIN = 10 ** 9  # Outranks any heuristic score
+CHECK_EVERY = 1024  # Nodes between clock checks
+
+classic_search = default_search()
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Engine:
+    """Alpha-beta search with iterative deepening under a time budget."""
+
+    def __init__(self, budget_ms=DEFAULT_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.nodes = 0
+        self.depth = 0  # Deepest fully searched depth of the last move
+        self.deadline = 0.0
+
+    def _ordered_moves(self, board, first=None):
+        moves = sorted(board.candidate_moves(), key=board.activity, reverse=True)
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _negamax(self, board, depth, alpha, beta, player, other, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+        if board.winner is not None:
+            return ply - WIN  # The previous move won; later losses score higher
+        if board.empty == 0:
+            return 0
+        if depth == 0:
+            return board.score if player == "X" else -board.score
+
+        for cell in self._ordered_moves(board):
+            board.play(cell, player)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, other, player, ply + 1)
+            finally:
+                board.undo()
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def search(self, board, player, other):
+        """Returns (cell, score) for the side to move on a LineBoard."""
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = time.perf_counter() + self.budget_ms / 1000
+        best_move = None
+        best_score = 0
+        for depth in range(1, board.empty + 1):
+            try:
+                alpha = -WIN - 1
+                move = None
+                for cell in self._ordered_moves(board, best_move):
+                    board.play(cell, player)
+                    try:
+                        score = -self._negamax(board, depth - 1, -WIN - 1, -alpha, other, player, 1)
+                    finally:
+                        board.undo()
+                    if move is None or score > alpha:
+                        alpha = score
+                        move = cell
+            except _Timeout:
+                break
+            best_move, best_score = move, alpha
+            self.depth = depth
+            if abs(best_score) > WIN - len(board.cells):
+                break  # Forced result found; deeper search can't change it
+        if best_move is None:
+            best_move = self._ordered_moves(board)[0]
+        return best_move, best_score
+
+
+def find_best_move(board, computer, player, win_length=None, budget_ms=DEFAULT_BUDGET_MS):
+    """Finds a move on an N x N nested-list board; K defaults to min(N, 5).
+
+    3x3 with 3 in a row uses the exact Minimax search, so it returns the same
+    move as find_best_move in the classic scripts.
+    """
+    size = len(board)
+    win_length = win_length or min(size, 5)
+    if size == 3 and win_length == 3:
+        return classic_search.find_best_move(board, computer, player)
+    line_board = LineBoard.from_board(board, win_length)
+    if line_board.is_full():
+        return None
+    cell, _ = Engine(budget_ms).search(line_board, computer, player)
+    return divmod(cell, size)
+
+
+def print_board(board):
+    """Prints the board in a readable format."""
+    for row in board:
+        print(" | ".join(row))
+        print("-" * (4 * len(row) - 3))
+
+
+def tic_tac_toe(size=3, win_length=3, budget_ms=DEFAULT_BUDGET_MS, playouts=None):
+    """Main function to run an N x N, K-in-a-row game against the computer.
+
+    With `playouts`, the computer uses Monte Carlo Tree Search instead of alpha-beta.
+    """
+    board = LineBoard(size, win_length)
+    engine = Engine(budget_ms)
+    mcts = MCTSStrategy(playouts, win_length=win_length) if playouts else None
+    player = "X"
+    computer = "O"
+    cells = size * size
+
+    while True:
+        print_board(board.to_board())
+
+        # Player Move
+        move = input(f"Enter your move (1-{cells}): ")
+
+        if not move.isdigit() or not (1 <= int(move) <= cells):
+            print(f"Invalid input. Choose a number between 1-{cells}.")
+            continue
+
+        move = int(move) - 1
+
+        if board.cells[move] != " ":
+            print("That spot is taken. Try again.")
+            continue
+
+        board.play(move, player)
+
+        if board.winner == player:
+            print_board(board.to_board())
+            print("Congratulations! You win!")
+            break
+
+        if board.is_full():
+            print_board(board.to_board())
+            print("It's a draw!")
+            break
+
+        # Computer Move
+        if mcts is not None:
+            row, col = mcts.choose_move(board.to_board(), computer, player)
+            move = row * size + col
+        elif size == 3 and win_length == 3:
+            row, col = classic_search.find_best_move(board.to_board(), computer, player)
+            move = row * 3 + col
+        else:
+            move, _ = engine.search(board, computer, player)
+        board.play(move, computer)
+        print(f"Computer chose {move + 1}")
+
+        if board.winner == computer:
+            print_board(board.to_board())
+            print("Computer wins! Better luck next time.")
+            break
+
+        if board.is_full():
+            print_board(board.to_board())
+            print("It's a draw!")
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play N x N, K-in-a-row against the computer.")
+    parser.add_argument("--size", type=int, default=3, help="board size N")
+    parser.add_argument("--win", type=int, default=None, help="marks in a row to win (default: min(N, 5))")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_MS, help="computer thinking time per move, in ms")
+    parser.add_argument("--playouts", type=int, default=None,
+                        help="use Monte Carlo Tree Search with this many playouts per move instead of alpha-beta")
+    args = parser.parse_args()
+    tic_tac_toe(args.size, args.win or min(args.size, 5), args.budget, args.playouts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from server import DEFAULT_PORT, DEFAULT_STRATEGY
+
+# Load test for server.py: many concurrent games over keep-alive HTTP.
+#
+# Each client plays random legal moves, one game after another, on its own
+# connection. Reports move latency percentiles and throughput.
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+
+
+async def play_games(client, games, strategy, latencies, rng):
+    """Plays `games` games with random moves, recording each move's latency in seconds."""
+    for _ in range(games):
+        status, state = await client.request("POST", "/games", {"strategy": strategy})
+        if status != 201:
+            raise RuntimeError(f"New game failed: {state}")
+        while state["status"] == "playing":
+            cell = rng.choice([i + 1 for i, mark in enumerate(state["board"]) if mark == " "])
+            started = time.perf_counter()
+            status, state = await client.request("POST", f"/games/{state['id']}/move", {"cell": cell})
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                raise RuntimeError(f"Move failed: {state}")
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run(host, port, concurrency, games_per_client, strategy, seed=0):
+    clients = [Client(host, port) for _ in range(concurrency)]
+    await asyncio.gather(*(client.connect() for client in clients))
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        play_games(client, games_per_client, strategy, latencies, random.Random(seed * 1_000_003 + index))
+        for index, client in enumerate(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    await asyncio.gather(*(client.close() for client in clients))
+
+    latencies.sort()
+    games = concurrency * games_per_client
+    return {
+        "concurrency": concurrency,
+        "games": games,
+        "moves": len(latencies),
+        "seconds": round(elapsed, 3),
+        "games_per_second": round(games / elapsed, 1),
+        "moves_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test server.py with many concurrent games.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--concurrency", type=int, default=1000, help="simultaneous games (one connection each)")
+    parser.add_argument("--games", type=int, default=5, help="games per connection")
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.host, args.port, args.concurrency, args.games, args.strategy, args.seed))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
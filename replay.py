@@ -0,0 +1,87 @@
+import argparse
+import json
+from collections import defaultdict
+
+from engine import check_winner, new_board, print_board
+from engine.records import RecordError, read_games
+
+# Replays recorded games (see simulate.py --record and engine/records.py).
+#
+# Every game is played back move by move through check_winner, so a record
+# that continues past a win, reuses a cell or ends early is counted as
+# invalid. Results are aggregated per pairing.
+
+
+def replay_game(record):
+    """Plays a record back; returns "X", "O" or None for a draw, or raises RecordError."""
+    board = new_board()
+    players = ("X", "O") if record.first == "X" else ("O", "X")
+    for ply, cell in enumerate(record.moves):
+        if cell > 8:
+            raise RecordError(f"Cell {cell} is off the board")
+        row, col = divmod(cell, 3)
+        if board[row][col] != " ":
+            raise RecordError(f"Cell {cell + 1} is played twice")
+        mark = players[ply % 2]
+        board[row][col] = mark
+        if check_winner(board, mark):
+            if ply != len(record.moves) - 1:
+                raise RecordError(f"Moves continue after {mark} wins")
+            return mark
+    if len(record.moves) != 9:
+        raise RecordError("Game ends before the board is full")
+    return None
+
+
+def replay(path, show=0):
+    """Replays every game in a file and returns stats per "X vs O" pairing."""
+    stats = defaultdict(lambda: {"games": 0, "x_wins": 0, "o_wins": 0, "draws": 0, "moves": 0, "invalid": 0})
+    for index, record in enumerate(read_games(path)):
+        pairing = stats[f"{record.x_strategy} vs {record.o_strategy}"]
+        pairing["games"] += 1
+        try:
+            winner = replay_game(record)
+        except RecordError:
+            pairing["invalid"] += 1
+            continue
+        pairing["moves"] += len(record.moves)
+        pairing[{"X": "x_wins", "O": "o_wins", None: "draws"}[winner]] += 1
+        if index < show:
+            board = new_board()
+            marks = ("X", "O") if record.first == "X" else ("O", "X")
+            for ply, cell in enumerate(record.moves):
+                board[cell // 3][cell % 3] = marks[ply % 2]
+            print(f"Game {index + 1}: {record.x_strategy} (X) vs {record.o_strategy} (O), seed {record.seed}, "
+                  f"moves {' '.join(str(cell + 1) for cell in record.moves)}")
+            print_board(board)
+            print("Winner:", winner or "draw")
+    for pairing in stats.values():
+        valid = pairing["games"] - pairing["invalid"]
+        moves = pairing.pop("moves")
+        pairing["average_length"] = moves / valid if valid else 0.0
+    return dict(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify recorded games and summarise them.")
+    parser.add_argument("path", help="record file written by simulate.py --record")
+    parser.add_argument("--show", type=int, default=0, metavar="N", help="print the first N games")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    try:
+        stats = replay(args.path, args.show)
+    except (OSError, RecordError) as error:
+        parser.error(str(error))
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    for name, pairing in stats.items():
+        games = pairing["games"]
+        print(f"{name}: {games:,} games, X wins {pairing['x_wins'] / games:.2%}  "
+              f"O wins {pairing['o_wins'] / games:.2%}  Draws {pairing['draws'] / games:.2%}, "
+              f"{pairing['average_length']:.2f} moves on average, {pairing['invalid']} invalid")
+
+
+if __name__ == "__main__":
+    main()
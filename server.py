@@ -0,0 +1,402 @@
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+
+from engine import Bitboard
+from engine.analysis import analyze
+from simulate import STRATEGIES, check_strategy, make_strategy
+
+# Local game server: many simultaneous games from one asyncio process.
+#
+# HTTP (JSON, keep-alive):
+#   POST /games                {"strategy": "mistake-medium"}  -> new game
+#   GET  /games/<id>                                           -> game state
+#   POST /games/<id>/move      {"cell": 5}                     -> play 1-9, computer replies
+#   GET  /games/<id>/analysis                                  -> value of every move for the player
+# WebSocket /ws: send {"op": "new" | "state" | "move" | "analysis", "id": ..., "cell": ...}
+# and receive the same JSON the HTTP endpoints return, plus "code" (the HTTP
+# status the request would have had).
+#
+# The player is X and opens; the computer is O. Computer moves run in a
+# process pool, so one slow search never blocks the other sessions.
+
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 200_000
+DEFAULT_STRATEGY = "mistake-medium"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+MAX_BODY = 64 * 1024  # Bytes per request body
+MAX_PLAYOUTS = 5000  # Cap for "mcts:<playouts>", so one game can't tie up a worker
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 409: "Conflict",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class FrameError(Exception):
+    """A WebSocket frame the server won't take; `code` is the close code to answer with."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class Session:
+    """One game: a 9-byte board plus a little state."""
+
+    __slots__ = ("board", "strategy", "status", "busy")
+
+    def __init__(self, strategy):
+        self.board = bytearray(b" " * 9)
+        self.strategy = strategy
+        self.status = "playing"
+        self.busy = False  # A move is being processed
+
+
+class SessionStore:
+    """Games by id; the least recently used game is dropped once the store is full."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.next_id = 1
+
+    def create(self, strategy):
+        game_id = self.next_id
+        self.next_id += 1
+        self.sessions[game_id] = Session(strategy)
+        if len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return game_id
+
+    def get(self, game_id):
+        session = self.sessions.get(game_id)
+        if session is None:
+            raise HTTPError(404, f"No game {game_id}")
+        self.sessions.move_to_end(game_id)
+        return session
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+def choose_move(strategy, cells):
+    """Runs in a pool worker: picks the computer's cell (0-8) for a 9-character board."""
+    board = [list(cells[r * 3:r * 3 + 3]) for r in range(3)]
+    row, col = make_strategy(strategy).choose_move(board, "O", "X")
+    return row * 3 + col
+
+
+def _status(board, mark):
+    position = Bitboard.from_board([[chr(cell) for cell in board[r * 3:r * 3 + 3]] for r in range(3)])
+    if position.check_winner(mark):
+        return "player_wins" if mark == "X" else "computer_wins"
+    if position.is_full():
+        return "draw"
+    return "playing"
+
+
+class GameServer:
+    def __init__(self, executor=None, max_sessions=MAX_SESSIONS):
+        self.store = SessionStore(max_sessions)
+        self.executor = executor
+
+    def state(self, game_id, session, computer_move=None):
+        state = {"id": game_id, "board": session.board.decode(), "status": session.status,
+                 "strategy": session.strategy}
+        if computer_move is not None:
+            state["computer_move"] = computer_move + 1
+        return state
+
+    def new_game(self, request):
+        strategy = request.get("strategy", DEFAULT_STRATEGY)
+        if not isinstance(strategy, str):
+            raise HTTPError(400, "\"strategy\" must be a string")
+        try:
+            check_strategy(strategy)
+        except ValueError as error:
+            raise HTTPError(400, str(error))
+        if strategy.startswith("mcts:") and int(strategy.split(":", 1)[1]) > MAX_PLAYOUTS:
+            raise HTTPError(400, f"This server allows at most {MAX_PLAYOUTS} playouts")
+        game_id = self.store.create(strategy)
+        return self.state(game_id, self.store.get(game_id))
+
+    def get_state(self, game_id):
+        return self.state(game_id, self.store.get(game_id))
+
+    def analysis(self, game_id):
+        """The player's moves with their value (1 win, 0 draw, -1 loss) and plies to the end; a table lookup."""
+        session = self.store.get(game_id)
+        state = self.state(game_id, session)
+        moves = []
+        if session.status == "playing" and not session.busy:
+            cells = session.board.decode()
+            board = [list(cells[r * 3:r * 3 + 3]) for r in range(3)]
+            moves = [{"cell": row * 3 + col + 1, "value": value, "distance": distance}
+                     for (row, col), value, distance in analyze(board, "X")]
+        state["moves"] = moves
+        return state
+
+    async def move(self, game_id, request):
+        session = self.store.get(game_id)
+        cell = request.get("cell")
+        if not isinstance(cell, int) or isinstance(cell, bool) or not 1 <= cell <= 9:
+            raise HTTPError(400, "Invalid input. Choose a number between 1-9.")
+        if session.status != "playing":
+            raise HTTPError(409, "The game is over.")
+        if session.busy:
+            raise HTTPError(409, "The computer is still thinking.")
+        if session.board[cell - 1] != ord(" "):
+            raise HTTPError(409, "That spot is taken. Try again.")
+
+        # X's mark goes on the board only with the computer's reply, so a failed search leaves the game as it was
+        board = session.board[:]
+        board[cell - 1] = ord("X")
+        status = _status(board, "X")
+        if status != "playing":
+            session.board[cell - 1] = ord("X")
+            session.status = status
+            return self.state(game_id, session)
+
+        session.busy = True
+        try:
+            cells = board.decode()
+            if self.executor is None:
+                computer = choose_move(session.strategy, cells)
+            else:
+                loop = asyncio.get_running_loop()
+                computer = await loop.run_in_executor(self.executor, choose_move, session.strategy, cells)
+        except Exception:
+            raise HTTPError(500, "The computer couldn't pick a move. Try again.")
+        finally:
+            session.busy = False
+        session.board[cell - 1] = ord("X")
+        session.board[computer] = ord("O")
+        session.status = _status(session.board, "O")
+        return self.state(game_id, session, computer)
+
+    async def dispatch(self, method, path, request):
+        """Routes one request; returns (status, JSON-able body)."""
+        parts = path.strip("/").split("/")
+        if parts == ["games"] and method == "POST":
+            return 201, self.new_game(request)
+        if len(parts) >= 2 and parts[0] == "games":
+            try:
+                game_id = int(parts[1])
+            except ValueError:
+                raise HTTPError(404, f"No game {parts[1]}")
+            if len(parts) == 2 and method == "GET":
+                return 200, self.get_state(game_id)
+            if len(parts) == 3 and parts[2] == "move" and method == "POST":
+                return 200, await self.move(game_id, request)
+            if len(parts) == 3 and parts[2] == "analysis" and method == "GET":
+                return 200, self.analysis(game_id)
+        raise HTTPError(404, f"No route for {method} {path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self.handle_websocket(reader, writer, headers)
+                    break
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    # The body can't be skipped safely, so answer and close the connection
+                    if length < 0:
+                        await self.write_response(writer, 400, {"error": "Invalid Content-Length"})
+                    else:
+                        error = f"Request bodies are limited to {MAX_BODY} bytes"
+                        await self.write_response(writer, 413, {"error": error})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.respond(method, path, body)
+                await self.write_response(writer, status, payload)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def respond(self, method, path, body):
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise HTTPError(400, "Expected a JSON object")
+            return await self.dispatch(method, path, request)
+        except json.JSONDecodeError:
+            return 400, {"error": "Invalid JSON"}
+        except HTTPError as error:
+            return error.status, {"error": str(error)}
+
+    async def handle_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        await writer.drain()
+        routes = {"new": ("POST", "/games"), "state": ("GET", "/games/{id}"), "move": ("POST", "/games/{id}/move"),
+                  "analysis": ("GET", "/games/{id}/analysis")}
+        text = None  # A fragmented text message still being received
+        while True:
+            try:
+                final, opcode, payload = await read_frame(reader)
+                if opcode >= 0x8:
+                    if not final or len(payload) > 125:
+                        raise FrameError(1002, "Control frames must be unfragmented and at most 125 bytes")
+                elif opcode == 0x0:
+                    if text is None:
+                        raise FrameError(1002, "Continuation frame without a message to continue")
+                    text += payload
+                    if len(text) > MAX_BODY:
+                        raise FrameError(1009, f"Messages are limited to {MAX_BODY} bytes")
+                elif text is not None:
+                    raise FrameError(1002, "New message before the last one was finished")
+                elif opcode == 0x1:
+                    text = bytearray(payload)
+                else:
+                    raise FrameError(1003, "Only text messages are accepted")
+            except FrameError as error:
+                writer.write(encode_frame(0x8, struct.pack("!H", error.code) + str(error).encode()))
+                await writer.drain()
+                return
+            if opcode == 0x8:  # Close
+                writer.write(encode_frame(0x8, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == 0x9:  # Ping
+                writer.write(encode_frame(0xA, payload))
+                await writer.drain()
+                continue
+            if opcode not in (0x0, 0x1) or not final:
+                continue  # A pong, or more of the message to come
+            payload, text = text, None
+            try:
+                message = json.loads(payload)
+                method, path = routes[message["op"]]
+                path = path.format(id=message.get("id"))
+            except (ValueError, KeyError, TypeError):
+                response = {"code": 400,
+                            "error": "Expected {\"op\": \"new\" | \"state\" | \"move\" | \"analysis\", ...}"}
+            else:
+                status, body = await self.respond(method, path, json.dumps(message).encode())
+                response = {"code": status, **body}
+            writer.write(encode_frame(0x1, json.dumps(response).encode()))
+            await writer.drain()
+
+
+async def read_frame(reader):
+    """Reads one client frame; returns (final, opcode, unmasked payload).
+
+    Raises FrameError for an unmasked frame or one over MAX_BODY, before its payload is read.
+    """
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if not second & 0x80:
+        raise FrameError(1002, "Client frames must be masked")
+    if length > MAX_BODY:
+        raise FrameError(1009, f"Messages are limited to {MAX_BODY} bytes")
+    mask = await reader.readexactly(4)
+    payload = await reader.readexactly(length)
+    return bool(first & 0x80), first & 0x0F, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+
+def encode_frame(opcode, payload, mask=None):
+    """Builds one final WebSocket frame (clients must pass a 4-byte mask)."""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        header.append(mask_bit | len(payload))
+    elif len(payload) < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", len(payload))
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", len(payload))
+    if mask:
+        header += mask
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return bytes(header) + payload
+
+
+def _warm_worker():
+    for name in STRATEGIES:
+        make_strategy(name)
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=None, max_sessions=MAX_SESSIONS):
+    executor = None
+    if workers != 0:
+        executor = concurrent.futures.ProcessPoolExecutor(workers or os.cpu_count() or 1,
+                                                          initializer=_warm_worker)
+    game_server = GameServer(executor, max_sessions)
+    server = await asyncio.start_server(game_server.handle_connection, host, port, backlog=4096)
+    print(f"Serving Tic-Tac-Toe on http://{host}:{port} (ws://{host}:{port}/ws)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Tic-Tac-Toe games over HTTP and WebSocket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for computer moves (default: one per core; 0 = in the event loop)")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
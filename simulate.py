@@ -0,0 +1,251 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from engine import (Bitboard, GradedStrategy, MistakeStrategy, PerfectStrategy, RandomStrategy, RuleBasedStrategy,
+                    load_mistake_chance)
+from engine.mcts import PLAYOUTS, MCTSStrategy
+from engine.records import GameWriter, encode_game
+
+# Headless self-play: pits two AIs against each other for many games.
+#
+# Games are split into chunks spread across a process pool. Every game gets
+# its own random.Random, seeded from the base seed and its game number and
+# handed to both strategies, so a run gives the same totals no matter how many
+# workers play it, and any single game replays on its own from its seed
+# (--game N, or play_seeded with the seed stored in a record). With --record,
+# every game is appended to a binary record file (see engine/records.py).
+
+CHUNK_SIZE = 1000
+
+
+def _mistake(level):
+    return lambda: MistakeStrategy(load_mistake_chance()[level])
+
+
+def _mcts(level):
+    return lambda: MCTSStrategy(PLAYOUTS[level])
+
+
+# Strategy name -> factory for the engine strategy each script plays
+STRATEGIES = {
+    "easy": RandomStrategy,
+    "hard": RuleBasedStrategy,
+    "mistake-easy": _mistake("easy"),
+    "mistake-medium": _mistake("medium"),
+    "mistake-hard": _mistake("hard"),
+    "perfect": PerfectStrategy,
+    "mcts-easy": _mcts("easy"),
+    "mcts-medium": _mcts("medium"),
+    "mcts-hard": _mcts("hard"),
+}
+
+# "<prefix>:<chance>" names build these at any mistake chance
+CHANCE_STRATEGIES = {"mistake": MistakeStrategy, "graded": GradedStrategy}
+
+_built = {}  # Strategies already built in this process
+
+
+def _split_chance(name):
+    """Returns (strategy class, chance text) for "mistake:<chance>"-style names, else (None, None)."""
+    prefix, sep, chance = name.partition(":")
+    if sep and prefix in CHANCE_STRATEGIES:
+        return CHANCE_STRATEGIES[prefix], chance
+    return None, None
+
+
+def make_strategy(name):
+    """Returns the strategy for a name, built once per process.
+
+    "mistake:<chance>" gives the mistake-mixed AI at any chance, and
+    "graded:<chance>" the AI whose mistakes drop one blunder class, and
+    "mcts:<playouts>" Monte Carlo Tree Search with any playout budget.
+    """
+    if name not in _built:
+        strategy, chance = _split_chance(name)
+        if strategy is not None:
+            _built[name] = strategy(float(chance))
+        elif name.startswith("mcts:"):
+            _built[name] = MCTSStrategy(int(name.split(":", 1)[1]))
+        else:
+            _built[name] = STRATEGIES[name]()
+    return _built[name]
+
+
+def check_strategy(name):
+    """Raises ValueError for an unknown strategy name."""
+    strategy, chance = _split_chance(name)
+    if strategy is not None:
+        try:
+            chance = float(chance)
+        except ValueError:
+            chance = -1.0
+        if not 0.0 <= chance <= 1.0:
+            raise ValueError(f"Mistake chance in {name!r} must be between 0 and 1")
+    elif name.startswith("mcts:"):
+        playouts = name.split(":", 1)[1]
+        if not playouts.isdigit() or int(playouts) < 1:
+            raise ValueError(f"Playouts in {name!r} must be a positive whole number")
+    elif name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name!r}; choose from {', '.join(STRATEGIES)}, "
+                         "mistake:<chance>, graded:<chance> or mcts:<playouts>")
+
+
+def strategy_difficulty(name):
+    """Returns the mistake chance a strategy plays with, or None."""
+    strategy, chance = _split_chance(name)
+    if strategy is not None:
+        return float(chance)
+    if name.startswith("mistake-"):
+        return load_mistake_chance()[name.split("-", 1)[1]]
+    return None
+
+
+def game_seed(seed, game):
+    """Seed for game number `game` of a run, unique per (seed, game)."""
+    return ((seed << 32) + game) & 0xFFFFFFFFFFFFFFFF
+
+
+def play_game(x_move, o_move, moves=None):
+    """Plays one game (X opens) and returns "X", "O" or None for a draw.
+
+    Pass a list as `moves` to collect the cells played (0-8).
+    """
+    board = [[" " for _ in range(3)] for _ in range(3)]
+    position = Bitboard()
+    turns = (("X", "O", x_move), ("O", "X", o_move))
+    for ply in range(9):
+        mark, other, move = turns[ply % 2]
+        row, col = move(board, mark, other)
+        board[row][col] = mark
+        position.place(mark, row, col)
+        if moves is not None:
+            moves.append(row * 3 + col)
+        if position.check_winner(mark):
+            return mark
+    return None
+
+
+def play_seeded(x_name, o_name, seed, moves=None):
+    """Plays one game with both strategies drawing from random.Random(seed); returns the winner."""
+    x_move = make_strategy(x_name)
+    o_move = make_strategy(o_name)
+    x_move.rng = o_move.rng = random.Random(seed)
+    return play_game(x_move, o_move, moves)
+
+
+def run_chunk(task):
+    """Plays one chunk of games in a worker; returns (x_wins, o_wins, draws, encoded records)."""
+    x_name, o_name, first_game, games, seed, record = task
+    results = {"X": 0, "O": 0, None: 0}
+    records = []
+    for game in range(first_game, first_game + games):
+        moves = [] if record else None
+        results[play_seeded(x_name, o_name, game_seed(seed, game), moves)] += 1
+        if record:
+            records.append(encode_game(moves, *record[:2], game_seed(seed, game), *record[2:]))
+    return results["X"], results["O"], results[None], b"".join(records)
+
+
+def _collect(chunks, totals, writer):
+    """Adds up chunk results as they arrive, streaming their records to `writer`."""
+    for x_wins, o_wins, draws, records in chunks:
+        totals[0] += x_wins
+        totals[1] += o_wins
+        totals[2] += draws
+        if writer is not None:
+            writer.write_encoded(records)
+
+
+def simulate(x_name, o_name, games, workers=None, seed=0, chunk_size=CHUNK_SIZE, pool=None, record=None):
+    """Plays `games` games and returns aggregate results and throughput.
+
+    Pass an open multiprocessing pool to reuse it across calls, and a file
+    path as `record` to append every game to a record file.
+    """
+    for name in (x_name, o_name):
+        check_strategy(name)
+    workers = workers or os.cpu_count() or 1
+    writer = None
+    record_info = None
+    if record:
+        writer = GameWriter(record)
+        record_info = (writer.strategy_id(x_name), writer.strategy_id(o_name),
+                       strategy_difficulty(x_name), strategy_difficulty(o_name))
+    tasks = []
+    for start in range(0, games, chunk_size):
+        tasks.append((x_name, o_name, start, min(chunk_size, games - start), seed, record_info))
+
+    started = time.perf_counter()
+    totals = [0, 0, 0]
+    try:
+        if pool is not None:
+            _collect(pool.imap(run_chunk, tasks), totals, writer)
+        elif workers == 1:
+            _collect(map(run_chunk, tasks), totals, writer)
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                _collect(pool.imap(run_chunk, tasks), totals, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - started
+
+    x_wins, o_wins, draws = totals
+    return {
+        "x": x_name,
+        "o": o_name,
+        "games": games,
+        "x_wins": x_wins,
+        "o_wins": o_wins,
+        "draws": draws,
+        "x_win_rate": x_wins / games,
+        "o_win_rate": o_wins / games,
+        "draw_rate": draws / games,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else float("inf"),
+        "workers": workers,
+        "seed": seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pit two Tic-Tac-Toe AIs against each other.")
+    parser.add_argument("x", help=f"strategy playing X (moves first): {', '.join(STRATEGIES)}, "
+                                  "mistake:<chance>, graded:<chance> or mcts:<playouts>")
+    parser.add_argument("o", help="strategy playing O")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--record", default=None, metavar="FILE", help="append every game to this record file")
+    parser.add_argument("--game", type=int, default=None, metavar="N",
+                        help="replay only game N of the run (0-based) and print its moves")
+    args = parser.parse_args()
+    for name in (args.x, args.o):
+        try:
+            check_strategy(name)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.game is not None:
+        moves = []
+        winner = play_seeded(args.x, args.o, game_seed(args.seed, args.game), moves)
+        print(f"Game {args.game} (seed {game_seed(args.seed, args.game)}): "
+              f"{' '.join(str(cell + 1) for cell in moves)}  {f'{winner} wins' if winner else 'draw'}")
+        return
+
+    result = simulate(args.x, args.o, args.games, args.workers, args.seed, record=args.record)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{args.x} (X) vs {args.o} (O), {result['games']} games")
+    print(f"X wins: {result['x_win_rate']:.2%}  O wins: {result['o_win_rate']:.2%}  Draws: {result['draw_rate']:.2%}")
+    print(f"{result['games_per_second']:,.0f} games/s on {result['workers']} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
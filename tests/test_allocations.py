@@ -0,0 +1,33 @@
+import unittest
+
+from bench import MID_GAME, _board, _empty, trace_search
+from engine.search import FlatSearch
+
+# FlatSearch's allocation budget, traced with tracemalloc (see bench.py).
+#
+# A search may allocate a few small objects (its result, the frame) but must
+# keep nothing once it returns, however many nodes it visits.
+
+PEAK_BYTES = 1024
+
+
+class FlatSearchAllocationTest(unittest.TestCase):
+    def check(self, boards):
+        peak, retained = trace_search(lambda: FlatSearch().find_best_move, boards)
+        self.assertEqual(retained, 0)
+        self.assertLessEqual(peak, PEAK_BYTES)
+
+    def test_empty_board(self):
+        self.check([_empty()])
+
+    def test_mid_game(self):
+        self.check([_board(cells) for cells in MID_GAME])
+
+    def test_node_count(self):
+        search = FlatSearch()
+        search.find_best_move(_empty(), "O", "X")
+        self.assertEqual(search.nodes, 16976)  # Past SMALL_INT_LIMIT, so folded into the slot along the way
+
+
+if __name__ == "__main__":
+    unittest.main()
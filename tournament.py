@@ -0,0 +1,207 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import zlib
+
+from simulate import check_strategy, run_chunk, strategy_difficulty
+
+# Round-robin tournament with Elo ratings for every AI.
+#
+# Each pairing is played as two legs of equal length so both sides open
+# (the first-named strategy plays X in the first leg, O in the second). The
+# chunks of every new pairing go to one shared process pool at once. Results
+# are cached per pairing in TOURNAMENT_FILE, keyed by the strategy names, their
+# mistake chances, the games per pairing and the seed, so adding a strategy
+# only plays its own pairings and recalibrating a level replays just that
+# level's.
+#
+# Ratings are fitted to all results at once (Bradley-Terry maximum likelihood
+# on the Elo scale, a draw scoring half a win), with one virtual drawn game per
+# pairing so that an unbeaten strategy still gets a finite rating. The mean
+# rating is 1500; the bounds are 95% intervals from the likelihood's curvature.
+
+TOURNAMENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tournament.json")
+
+# The AIs the scripts play: easy.py, hard.py, choose-level.py / GUI levels, unbeatable.py
+DEFAULT_ROSTER = ["easy", "hard", "mistake-easy", "mistake-medium", "mistake-hard", "perfect"]
+
+DEFAULT_GAMES = 2000  # Per pairing, split evenly between the two legs
+CHUNK_SIZE = 250
+MEAN_RATING = 1500.0
+ELO_SCALE = 400 / math.log(10)  # Elo points per unit of log-odds
+PRIOR_DRAWS = 1.0
+Z_95 = 1.96
+
+
+def pairing_key(a, b, games, seed):
+    """Cache key for one pairing; changes when a strategy's mistake chance does."""
+    return "|".join(f"{name}@{strategy_difficulty(name)}" for name in (a, b)) + f"|{games}|{seed}"
+
+
+def _leg_seed(key, leg):
+    return zlib.crc32(f"{key}|{leg}".encode())
+
+
+def load_cache(path=TOURNAMENT_FILE):
+    """Returns {pairing key: result} from a previous run, or {} if there is none."""
+    try:
+        with open(path) as f:
+            return json.load(f)["pairings"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return {}
+
+
+def save_cache(pairings, path=TOURNAMENT_FILE):
+    with open(path, "w") as f:
+        json.dump({"pairings": pairings}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def play_pairings(pairings, games, seed, workers=None, chunk_size=CHUNK_SIZE):
+    """Plays every (a, b) pairing in both legs; returns {pairing key: result}."""
+    tasks = []
+    owners = []  # (key, leg) of each task
+    for a, b in pairings:
+        key = pairing_key(a, b, games, seed)
+        for leg, (x_name, o_name) in enumerate(((a, b), (b, a))):
+            leg_games = games // 2
+            for start in range(0, leg_games, chunk_size):
+                tasks.append((x_name, o_name, start, min(chunk_size, leg_games - start), _leg_seed(key, leg), None))
+                owners.append((key, leg))
+
+    results = {}
+    for a, b in pairings:
+        key = pairing_key(a, b, games, seed)
+        results[key] = {"a": a, "b": b, "games": 0, "a_wins": 0, "b_wins": 0, "draws": 0,
+                        "a_first": [0, 0, 0], "b_first": [0, 0, 0]}
+    if not tasks:
+        return results
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _add_chunks(map(run_chunk, tasks), owners, results)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            _add_chunks(pool.imap(run_chunk, tasks), owners, results)
+    return results
+
+
+def _add_chunks(chunks, owners, results):
+    for (key, leg), (x_wins, o_wins, draws, _) in zip(owners, chunks):
+        result = results[key]
+        a_wins, b_wins = (x_wins, o_wins) if leg == 0 else (o_wins, x_wins)
+        result["games"] += x_wins + o_wins + draws
+        result["a_wins"] += a_wins
+        result["b_wins"] += b_wins
+        result["draws"] += draws
+        opening = result["a_first" if leg == 0 else "b_first"]  # [opener wins, other wins, draws]
+        opening[0] += x_wins
+        opening[1] += o_wins
+        opening[2] += draws
+
+
+def fit_ratings(players, results, iterations=1000):
+    """Returns {player: (rating, low, high)} fitted to pairing results."""
+    scores = {player: 0.0 for player in players}
+    games = {player: {} for player in players}
+    for result in results:
+        a, b = result["a"], result["b"]
+        if a not in scores or b not in scores:
+            continue
+        count = result["games"] + PRIOR_DRAWS
+        scores[a] += result["a_wins"] + (result["draws"] + PRIOR_DRAWS) / 2
+        scores[b] += result["b_wins"] + (result["draws"] + PRIOR_DRAWS) / 2
+        games[a][b] = games[a].get(b, 0) + count
+        games[b][a] = games[b].get(a, 0) + count
+
+    # Minorization-maximization (Zermelo's iteration) on strengths exp(rating / ELO_SCALE)
+    strength = {player: 1.0 for player in players}
+    for _ in range(iterations):
+        change = 0.0
+        for player in players:
+            denominator = sum(count / (strength[player] + strength[other])
+                              for other, count in games[player].items())
+            if denominator:
+                updated = scores[player] / denominator
+                change = max(change, abs(math.log(updated / strength[player])))
+                strength[player] = updated
+        mean = sum(math.log(value) for value in strength.values()) / len(strength)
+        strength = {player: math.exp(math.log(value) - mean) for player, value in strength.items()}
+        if change < 1e-9:
+            break
+
+    ratings = {}
+    for player in players:
+        rating = MEAN_RATING + ELO_SCALE * math.log(strength[player])
+        information = 0.0
+        for other, count in games[player].items():
+            expected = strength[player] / (strength[player] + strength[other])
+            information += count * expected * (1 - expected)
+        margin = Z_95 * ELO_SCALE / math.sqrt(information) if information else math.inf
+        ratings[player] = (rating, rating - margin, rating + margin)
+    return ratings
+
+
+def tournament(players, games=DEFAULT_GAMES, seed=0, workers=None, path=TOURNAMENT_FILE, refresh=False):
+    """Plays every pairing not in the cache, saves it and returns (ratings, results, pairings played)."""
+    for name in players:
+        check_strategy(name)
+    cache = {} if refresh else load_cache(path)
+    # Names sorted within a pairing, so the same two strategies always share one cache entry
+    pairings = [tuple(sorted((a, b))) for index, a in enumerate(players) for b in players[index + 1:]]
+    missing = [(a, b) for a, b in pairings if pairing_key(a, b, games, seed) not in cache]
+    cache.update(play_pairings(missing, games, seed, workers))
+    save_cache(cache, path)
+    results = [cache[pairing_key(a, b, games, seed)] for a, b in pairings]
+    return fit_ratings(players, results), results, len(missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament with Elo ratings for the AIs.")
+    parser.add_argument("players", nargs="*", default=DEFAULT_ROSTER,
+                        help=f"strategies as in simulate.py (default: {' '.join(DEFAULT_ROSTER)})")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES,
+                        help="games per pairing, half with each side opening")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=TOURNAMENT_FILE, help="file of completed pairings")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached pairings and replay everything")
+    parser.add_argument("--json", action="store_true", help="print ratings and pairings as JSON")
+    args = parser.parse_args()
+    if args.games < 2 or args.games % 2:
+        parser.error("--games must be an even number of at least 2")
+    if len(set(args.players)) != len(args.players) or len(args.players) < 2:
+        parser.error("Give at least two different strategies")
+    for name in args.players:
+        try:
+            check_strategy(name)
+        except ValueError as error:
+            parser.error(str(error))
+
+    started = time.perf_counter()
+    ratings, results, played = tournament(args.players, args.games, args.seed, args.workers, args.cache,
+                                          args.refresh)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps({
+            "ratings": {player: {"rating": round(rating, 1), "low": round(low, 1), "high": round(high, 1)}
+                        for player, (rating, low, high) in ratings.items()},
+            "pairings": results,
+        }, indent=2))
+        return
+
+    print(f"{len(results)} pairings, {played} played now ({len(results) - played} cached) in {elapsed:.1f} s")
+    for rank, (player, (rating, low, high)) in enumerate(sorted(ratings.items(), key=lambda item: -item[1][0]), 1):
+        print(f"{rank:2}. {player:<16} {rating:7.1f}  [{low:7.1f}, {high:7.1f}]")
+    print()
+    for result in results:
+        print(f"{result['a']} vs {result['b']}: +{result['a_wins']} -{result['b_wins']} ={result['draws']}  "
+              f"({result['a']} opening +{result['a_first'][0]} -{result['a_first'][1]}, "
+              f"{result['b']} opening +{result['b_first'][0]} -{result['b_first'][1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,22 @@
-import random
+import argparse
 
-def print_board(board):
-    """Prints the Tic-Tac-Toe board in a readable format."""
-    for row in board:
-        print(" | ".join(row))
-        print("-" * 9)
+from engine import GameState, PerfectStrategy, print_board
+from engine import find_best_move  # noqa: F401 (plain Minimax, checked by verify.py)
+from engine.instrument import InstrumentedStrategy, add_arguments, make_profiled_search, run_game
+from engine.records import record_game
 
-def check_winner(board, player):
-    """Checks if a player has won the game."""
-    for i in range(3):
-        if all(board[i][j] == player for j in range(3)) or all(board[j][i] == player for j in range(3)):
-            return True
-    if all(board[i][i] == player for i in range(3)) or all(board[i][2 - i] == player for i in range(3)):
-        return True
-    return False
-
-def get_available_moves(board):
-    """Finds all empty spaces on the board."""
-    return [(r, c) for r in range(3) for c in range(3) if board[r][c] == " "]
-
-def is_full(board):
-    """Checks if the board is full (draw condition)."""
-    return all(cell != " " for row in board for cell in row)
-
-def minimax(board, depth, is_maximizing, computer, player):
-    """Minimax algorithm for making the AI unbeatable."""
-    if check_winner(board, computer):
-        return 1  # AI wins
-    if check_winner(board, player):
-        return -1  # Player wins
-    if is_full(board):
-        return 0  # It's a draw
-
-    available_moves = get_available_moves(board)
-
-    if is_maximizing:
-        best_score = -float("inf")  # AI wants the highest score
-        for row, col in available_moves:
-            board[row][col] = computer
-            score = minimax(board, depth + 1, False, computer, player)
-            board[row][col] = " "  # Undo move
-            best_score = max(best_score, score)
-        return best_score
-    else:
-        best_score = float("inf")  # Player wants the lowest score
-        for row, col in available_moves:
-            board[row][col] = player
-            score = minimax(board, depth + 1, True, computer, player)
-            board[row][col] = " "  # Undo move
-            best_score = min(best_score, score)
-        return best_score
-
-def find_best_move(board, computer, player):
-    """Finds the best move for the computer using Minimax."""
-    best_score = -float("inf")
-    best_move = None
-
-    for row, col in get_available_moves(board):
-        board[row][col] = computer
-        score = minimax(board, 0, False, computer, player)  # Run Minimax
-        board[row][col] = " "  # Undo move
-
-        if score > best_score:
-            best_score = score
-            best_move = (row, col)
-
-    return best_move
+# Uses the perfect-play table (engine/perfect_table.bin), falling back to Minimax
+strategy = PerfectStrategy()
 
 def computer_move(board, computer, player):
-    """AI selects the best move using Minimax."""
-    row, col = find_best_move(board, computer, player)
+    """AI selects the best move from the perfect-play table, falling back to Minimax."""
+    row, col = strategy.choose_move(board, computer, player)
     return row, col
 
-def tic_tac_toe():
-    """Main function to run the Tic-Tac-Toe game."""
-    board = [[" " for _ in range(3)] for _ in range(3)]
+def tic_tac_toe(read_move=input):
+    """Main function to run the Tic-Tac-Toe game; returns the finished GameState."""
+    state = GameState()
+    board = state.board
     player = "X"
     computer = "O"
     
@@ -82,7 +24,7 @@ def tic_tac_toe():
         print_board(board)
 
         # Player Move
-        move = input("Enter your move (1-9): ")
+        move = read_move("Enter your move (1-9): ")
         
         if not move.isdigit() or not (1 <= int(move) <= 9):
             print("Invalid input. Choose a number between 1-9.")
@@ -95,32 +37,49 @@ def tic_tac_toe():
             print("That spot is taken. Try again.")
             continue
         
-        board[row][col] = player
+        won = state.play(row, col, player)
 
-        if check_winner(board, player):
+        if won:
             print_board(board)
             print("Congratulations! You win!")
             break
         
-        if is_full(board):
+        if state.is_full():
             print_board(board)
             print("It's a draw!")
             break
 
         # Perfect Computer Move
         row, col = computer_move(board, computer, player)
-        board[row][col] = computer
+        won = state.play(row, col, computer)
         print(f"Computer chose {row * 3 + col + 1}")
 
-        if check_winner(board, computer):
+        if won:
             print_board(board)
             print("Computer wins! Better luck next time.")
             break
         
-        if is_full(board):
+        if state.is_full():
             print_board(board)
             print("It's a draw!")
             break
 
+    return state
+
+def main():
+    global strategy
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the unbeatable computer.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.stats or args.no_table:
+        strategy = PerfectStrategy(table=False if args.no_table else None, search=make_profiled_search())
+    if args.stats:
+        strategy = InstrumentedStrategy(strategy, verbose=True)
+    state = run_game(tic_tac_toe, args)
+    if args.record and state is not None:
+        record_game(args.record, state.history, "human", "perfect")
+    if args.stats:
+        strategy.report()
+
 if __name__ == "__main__":
-    tic_tac_toe()
\ No newline at end of file
+    main()
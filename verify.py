@@ -0,0 +1,202 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import hard
+import unbeatable
+from engine import (AlphaBetaSearch, CachedSearch, FlatSearch, GradedStrategy, MistakeStrategy, PerfectStrategy,
+                    StateSearch, check_winner, make_mistake)
+from engine.retrograde import default_graph, side_to_move
+
+# Exhaustive correctness harness: every strategy against the solved game.
+#
+# Walks every non-terminal position of the game graph (engine/retrograde.py)
+# with either side to move and checks that
+#   - unbeatable.py's find_best_move, its table-backed computer_move and every
+#     optimal search/strategy pick a value-optimal move,
+#   - hard.py's find_best_move never misses an immediate win or a needed block,
+#   - make_mistake and the mistake branch only play legal moves.
+# Checks that use random numbers run with several seeds per position.
+# Positions are spread over a process pool; the exit status is 1 on any failure.
+
+SEEDS_PER_POSITION = 4
+HEAVY_EMPTIES = 7  # Positions with this many free cells are a task each
+REFERENCE = "unbeatable.find_best_move"  # Plain Minimax: by far the slowest check
+
+_graph = None
+_checks = None
+
+
+def _init_worker(skip_reference):
+    global _graph, _checks
+    _graph = default_graph()
+    _checks = {name: check for name, check in make_checks().items() if not (skip_reference and name == REFERENCE)}
+
+
+def make_checks():
+    """Returns {name: check(graph, index, board, mover, other)}; a check returns an error message or None."""
+    no_table = PerfectStrategy(table=False, search=CachedSearch())
+    alphabeta = AlphaBetaSearch()
+    flat = FlatSearch()
+    state = StateSearch()
+    optimal_mistake = MistakeStrategy(0.0)
+    optimal_graded = GradedStrategy(0.0)
+    always_mistake = MistakeStrategy(1.0)
+
+    def optimal(choose):
+        def check(graph, index, board, mover, other):
+            return _check_optimal(graph, index, choose(_copy(board), mover, other))
+        return check
+
+    def seeded(check):
+        def run(graph, index, board, mover, other):
+            for seed in range(SEEDS_PER_POSITION):
+                random.seed(index * SEEDS_PER_POSITION + seed)
+                error = check(graph, index, board, mover, other)
+                if error:
+                    return f"{error} (seed {seed})"
+            return None
+        return run
+
+    def legal(choose):
+        def check(graph, index, board, mover, other):
+            move = choose(_copy(board), mover, other)
+            if _child(graph, index, move) is None:
+                return f"illegal move {move}"
+            return None
+        return seeded(check)
+
+    return {
+        REFERENCE: optimal(unbeatable.find_best_move),
+        "unbeatable.computer_move": optimal(unbeatable.computer_move),
+        "search/minimax (cached, no table)": optimal(no_table.choose_move),
+        "search/alphabeta": optimal(alphabeta.find_best_move),
+        "search/flat": optimal(flat.find_best_move),
+        "search/state (make/unmake)": optimal(state.find_best_move),
+        "mistake strategy, optimal branch": seeded(optimal(optimal_mistake.choose_move)),
+        "graded strategy, optimal branch": seeded(optimal(optimal_graded.choose_move)),
+        "hard.find_best_move wins and blocks": seeded(_check_rules),
+        "make_mistake legal": legal(make_mistake),
+        "mistake strategy, mistake branch legal": legal(always_mistake.choose_move),
+    }
+
+
+def _copy(board):
+    return [row[:] for row in board]
+
+
+def _child(graph, index, move):
+    """Returns the position number after `move`, or None if it isn't a legal move."""
+    if move is None:
+        return None
+    row, col = move
+    for cell, child in graph.moves(index):
+        if cell == row * 3 + col:
+            return child
+    return None
+
+
+def _check_optimal(graph, index, move):
+    child = _child(graph, index, move)
+    if child is None:
+        return f"illegal move {move}"
+    if graph.values[child] != -graph.values[index]:
+        return f"move {move} is worth {-graph.values[child]}, the position is worth {graph.values[index]}"
+    return None
+
+
+def _completing(board, mark):
+    """Cells where `mark` would complete a line."""
+    cells = []
+    for r in range(3):
+        for c in range(3):
+            if board[r][c] == " ":
+                board[r][c] = mark
+                if check_winner(board, mark):
+                    cells.append((r, c))
+                board[r][c] = " "
+    return cells
+
+
+def _check_rules(graph, index, board, mover, other):
+    move = hard.find_best_move(_copy(board), mover, other)
+    if _child(graph, index, move) is None:
+        return f"illegal move {move}"
+    wins = _completing(board, mover)
+    if wins and move not in wins:
+        return f"missed a win at {wins}, played {move}"
+    blocks = _completing(board, other)
+    if not wins and blocks and move not in blocks:
+        return f"missed a block at {blocks}, played {move}"
+    return None
+
+
+def run_positions(indices):
+    """Runs in a pool worker: every check on some positions; returns ({check: positions}, [failures])."""
+    counts = dict.fromkeys(_checks, 0)
+    failures = []
+    for index in indices:
+        board = _graph.board(index)
+        mover = side_to_move(board)
+        other = "O" if mover == "X" else "X"
+        for name, check in _checks.items():
+            error = check(_graph, index, board, mover, other)
+            counts[name] += 1
+            if error:
+                failures.append((name, "".join(cell for row in board for cell in row), error))
+    return counts, failures
+
+
+def verify(workers=None, skip_reference=False):
+    """Checks every non-terminal position; returns ({check: positions}, [failures], seconds)."""
+    graph = default_graph()
+    positions = [index for index in range(len(graph)) if graph.offsets[index] != graph.offsets[index + 1]]
+    # Emptiest boards first and on their own: they cost the most, so the pool balances better
+    empties = {index: sum(cell == " " for row in graph.board(index) for cell in row) for index in positions}
+    positions.sort(key=lambda index: -empties[index])
+    heavy = [[index] for index in positions if empties[index] >= HEAVY_EMPTIES]
+    light = [index for index in positions if empties[index] < HEAVY_EMPTIES]
+    tasks = heavy + [light[start:start + 20] for start in range(0, len(light), 20)]
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(skip_reference)
+        results = list(map(run_positions, tasks))
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(skip_reference,)) as pool:
+            results = list(pool.imap_unordered(run_positions, tasks))
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    failures = []
+    for chunk_counts, chunk_failures in results:
+        for name, count in chunk_counts.items():
+            counts[name] = counts.get(name, 0) + count
+        failures.extend(chunk_failures)
+    return counts, failures, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every strategy on every reachable position.")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--skip-reference", action="store_true",
+                        help=f"skip {REFERENCE} (plain Minimax), which takes most of the time")
+    parser.add_argument("--show", type=int, default=20, help="failures to print")
+    args = parser.parse_args()
+
+    counts, failures, elapsed = verify(args.workers, args.skip_reference)
+    for name, count in counts.items():
+        failed = sum(1 for failure in failures if failure[0] == name)
+        print(f"{'FAIL' if failed else 'ok  '} {name}: {count} positions, {failed} failures")
+    for name, cells, error in failures[:args.show]:
+        print(f"  {name} on {cells!r}: {error}", file=sys.stderr)
+    print(f"{len(failures)} failures in {elapsed:.1f} s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()